@@ -0,0 +1,55 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    cells = {}
+    for row in range(1, rows + 1):
+        cells[f"A{row}"] = str(row)
+        cells[f"B{row}"] = f"=A{row}*2"
+        # every row reads the total, so any edit in A dirties the whole of C
+        cells[f"C{row}"] = f"=B{row}*100/D1"
+    cells["D1"] = f"=Sum(B1:B{rows})"
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+def paste(rows: int, value: int) -> dict:
+    return {f"A{row}": str(row + value) for row in range(1, rows + 1)}
+
+
+def main(rows: int = 2000, pasted: int = 1000) -> None:
+    sheet = build(rows)
+    start = time.perf_counter()
+    sheet.set_cell("A1", "0")
+    sheet.recalculate()
+    single = time.perf_counter() - start
+
+    sheet = build(rows)
+    start = time.perf_counter()
+    for name, expr in paste(pasted, 1).items():
+        sheet.set_cell(name, expr)
+        sheet.recalculate()
+    one_by_one = time.perf_counter() - start
+
+    sheet = build(rows)
+    start = time.perf_counter()
+    with sheet.batch():
+        for name, expr in paste(pasted, 1).items():
+            sheet.set_cell(name, expr)
+    batched = time.perf_counter() - start
+
+    print(f"one edit + recalc:               {single * 1000:8.1f} ms")
+    print(f"{pasted}-cell paste, recalc per edit: {one_by_one * 1000:8.1f} ms")
+    print(f"{pasted}-cell paste in one batch:     {batched * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+
+
+# PYTHONPATH=src python benchmarks/bench_batch_paste.py
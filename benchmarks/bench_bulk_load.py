@@ -0,0 +1,28 @@
+import sys
+import time
+
+from sheet_engine.parse_cache import parse_cache
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def main(rows: int = 50_000) -> None:
+    parse_cache.clear()
+    sheet = Spreadsheet()
+    start = time.perf_counter()
+    for row in range(1, rows + 1):
+        sheet.set_cell(f"A{row}", str(row))
+        sheet.set_cell(f"B{row}", f"=A{row}*2+{row}")
+    elapsed = time.perf_counter() - start
+
+    # every miss is one tokenize + parse
+    parses = parse_cache.misses
+    print(f"formulas loaded:   {rows}")
+    print(f"parses:            {parses} ({parses / rows:.2f} per formula)")
+    print(f"load time:         {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_bulk_load.py
@@ -0,0 +1,47 @@
+import re
+import sys
+import time
+
+from sheet_engine.cell_ref import cell_key, cell_name, col_index, col_name, unpack
+
+
+def regex_split(name: str) -> tuple[int, int]:
+    # what every name lookup did before the codec
+    letters, row = re.match(r"([A-Z]+)(\d+)", name).groups()
+    return col_index(letters), int(row)
+
+
+def main(cells: int = 10_000, rounds: int = 20) -> None:
+    names = [f"{col_name(i % 50)}{i // 50 + 1}" for i in range(cells)]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            col, row = regex_split(name)
+            f"{col_name(col)}{row}"
+    regex = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            cell_name(cell_key(name))
+    codec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            unpack(cell_key(name))
+    decode = time.perf_counter() - start
+
+    total = cells * rounds
+    print(f"regex + format: {regex / total * 1e9:6.0f} ns/name")
+    print(f"codec:          {codec / total * 1e9:6.0f} ns/name")
+    print(f"codec, decode:  {decode / total * 1e9:6.0f} ns/name")
+    print(f"speedup:        {regex / codec:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_cell_codec.py
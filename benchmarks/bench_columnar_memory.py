@@ -0,0 +1,41 @@
+import sys
+import time
+import tracemalloc
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def values_size(rows: int, columnar: bool) -> tuple[int, float]:
+    # memory held by the values store alone, cells and graph are measured before it fills
+    sheet = Spreadsheet(columnar=columnar)
+    for row in range(1, rows + 1):
+        sheet.set_cell(f"A{row}", str(row))
+        sheet.set_cell(f"B{row}", f"=A{row}/3")
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    sheet.recalculate()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, elapsed
+
+
+def main(rows: int = 200_000) -> None:
+    sizes = {}
+    for columnar in (False, True):
+        size, elapsed = values_size(rows, columnar)
+        sizes[columnar] = size
+        label = "columnar" if columnar else "dict"
+        print(
+            f"{label:>8}: {size / 2**20:7.1f} MiB for {2 * rows} values "
+            f"({size / (2 * rows):.1f} B/value), recalc {elapsed:.2f}s"
+        )
+    print(f"saved: {1 - sizes[True] / sizes[False]:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_columnar_memory.py
@@ -0,0 +1,61 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int, compile_formulas: bool) -> Spreadsheet:
+    sheet = Spreadsheet(compile_formulas=compile_formulas)
+    sheet.set_cell("A1", "3")
+    for row in range(1, rows + 1):
+        sheet.set_cell(f"B{row}", str(row))
+        sheet.set_cell(
+            f"C{row}", f"=(A1*B{row}+B{row}/A1-2)*(B{row}-A1)+Max(B{row}, 10)^2"
+        )
+    return sheet
+
+
+def recalc_time(sheet: Spreadsheet, rounds: int) -> float:
+    start = time.perf_counter()
+    for i in range(rounds):
+        sheet.set_cell("A1", str(i + 2))
+        sheet.recalculate()
+    return time.perf_counter() - start
+
+
+def evaluate_time(sheet: Spreadsheet, rounds: int) -> float:
+    # formula evaluation alone, without the recalc bookkeeping around it
+    cells = [
+        (expr, sheet._generate_values(name))
+        for name, expr in sheet.cells.items()
+        if expr.tree is not None
+    ]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for expr, value_dict in cells:
+            expr.evaluate(value_dict, sheet.compile_formulas)
+    return time.perf_counter() - start
+
+
+def main(rows: int = 20_000, rounds: int = 5) -> None:
+    recalc = {}
+    evaluate = {}
+    for compile_formulas in (False, True):
+        sheet = build(rows, compile_formulas)
+        sheet.recalculate()
+        recalc[compile_formulas] = recalc_time(sheet, rounds)
+        evaluate[compile_formulas] = evaluate_time(sheet, rounds)
+        label = "compiled" if compile_formulas else "tree walk"
+        print(
+            f"{label:>10}: recalc {recalc[compile_formulas]:.3f}s, "
+            f"evaluate only {evaluate[compile_formulas]:.3f}s ({rounds} rounds of {rows} cells)"
+        )
+    print(f"recalc speedup:   {recalc[False] / recalc[True]:.2f}x")
+    print(f"evaluate speedup: {evaluate[False] / evaluate[True]:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_compiled_eval.py
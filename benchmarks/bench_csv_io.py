@@ -0,0 +1,64 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from sheet_engine import csv_io
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def write_source(path: str, rows: int) -> None:
+    # inputs, a fill-down formula and a running reference to the row above
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        for row in range(1, rows + 1):
+            above = max(row - 1, 1)
+            writer.writerow([row, row % 7, f"=A{row}*2+B{row}", f"=C{row}+A{above}"])
+
+
+def main(rows: int = 100_000) -> None:
+    folder = tempfile.mkdtemp()
+    source = os.path.join(folder, "source.csv")
+    target = os.path.join(folder, "target.csv")
+    write_source(source, rows)
+
+    # baseline: csv.reader into one set_cell per field
+    start = time.perf_counter()
+    single = Spreadsheet()
+    with open(source, newline="") as file:
+        for row, fields in enumerate(csv.reader(file), 1):
+            for letter, text in zip("ABCD", fields):
+                single.set_cell(f"{letter}{row}", text)
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sheet = Spreadsheet()
+    csv_io.import_csv(sheet, source)
+    imported = time.perf_counter() - start
+
+    start = time.perf_counter()
+    csv_io.export_csv(sheet, target)
+    exported = time.perf_counter() - start
+
+    with open(target, newline="") as file:
+        assert sum(1 for _ in file) == rows
+    single.recalculate()
+    assert sheet.values == single.values
+
+    print(f"rows:                  {rows} ({rows * 4} cells)")
+    print(f"set_cell per field:    {baseline:.2f}s, {rows / baseline:,.0f} rows/s")
+    print(
+        f"import_csv:            {imported:.2f}s, {rows / imported:,.0f} rows/s"
+        f" ({baseline / imported:.1f}x)"
+    )
+    print(f"export_csv:            {exported:.2f}s, {rows / exported:,.0f} rows/s")
+    os.remove(source)
+    os.remove(target)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_csv_io.py
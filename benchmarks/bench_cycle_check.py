@@ -0,0 +1,74 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def full_dfs_has_cycle(sheet: Spreadsheet, start: str) -> bool:
+    # what every set_cell used to pay: a search over the whole upstream graph
+    stack = [start]
+    visited = set()
+    while stack:
+        current = stack.pop()
+        for next_cell in sheet.deps.get(current, ()):
+            if next_cell == start:
+                return True
+            if next_cell not in visited:
+                visited.add(next_cell)
+                stack.append(next_cell)
+    return False
+
+
+def add_rows(sheet: Spreadsheet, first: int, last: int) -> None:
+    # column D is one long chain (deep upstream for the tail edits), every row also
+    # holds a short independent chain A -> B -> C (a small affected region for rewiring)
+    for row in range(first, last + 1):
+        sheet.set_cell(f"D{row}", f"=D{row - 1}+1" if row > 1 else "1")
+        sheet.set_cell(f"A{row}", str(row))
+        sheet.set_cell(f"B{row}", f"=A{row}*2")
+        sheet.set_cell(f"C{row}", f"=B{row}+1")
+
+
+def time_edits(sheet: Spreadsheet, edits: list[tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    for name, expr in edits:
+        sheet.set_cell(name, expr)
+    return (time.perf_counter() - start) / len(edits)
+
+
+def main(max_rows: int = 25_000, edits: int = 200) -> None:
+    sheet = Spreadsheet()
+    rows = 0
+    print(f"{'formulas':>10} {'tail edit':>12} {'reorder edit':>14} {'full dfs':>12}")
+    for target in sorted({min(size, max_rows) for size in (250, 2_500, max_rows)}):
+        add_rows(sheet, rows + 1, target)
+        rows = target
+
+        # the new edge already respects the order
+        tail = [(f"D{rows}", f"=D{rows - 1}+{i}") for i in range(edits)]
+        # an early cell starts reading a late one, so the order has to be repaired
+        reorder = []
+        for i in range(edits // 2):
+            early = i % 10 + 1
+            reorder.append((f"B{early}", f"=A{early}+C{rows - i % 10}"))
+            reorder.append((f"B{early}", f"=A{early}*2"))
+
+        per_tail = time_edits(sheet, tail)
+        per_reorder = time_edits(sheet, reorder)
+
+        start = time.perf_counter()
+        for _ in range(edits):
+            full_dfs_has_cycle(sheet, f"D{rows}")
+        per_dfs = (time.perf_counter() - start) / edits
+
+        print(
+            f"{rows * 4:>10} {per_tail * 1e6:>10.1f}us {per_reorder * 1e6:>12.1f}us "
+            f"{per_dfs * 1e6:>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_cycle_check.py
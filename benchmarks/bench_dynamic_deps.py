@@ -0,0 +1,65 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def cells(rows: int) -> dict:
+    # a cheap branch taken on every row and an expensive one that isn't
+    result = {}
+    for row in range(1, rows + 1):
+        result[f"A{row}"] = "1"
+        result[f"B{row}"] = str(row)
+        result[f"C{row}"] = f"=D{row}*2+Max(D{row}:D{row + 19})"
+        result[f"D{row}"] = str(row % 13)
+        result[f"E{row}"] = f"=If(A{row}>0, B{row}*2, C{row}+Sum(D{row}:D{row + 9}))"
+    return result
+
+
+def read_outputs(sheet: Spreadsheet, rows: int) -> float:
+    start = time.perf_counter()
+    for row in range(1, rows + 1):
+        sheet.get_cell_value(f"E{row}")
+    return time.perf_counter() - start
+
+
+def main(rows: int = 20_000) -> None:
+    sheet = Spreadsheet()
+    sheet.set_cells(cells(rows))
+
+    first = read_outputs(sheet, rows)
+    print(f"cells:                 {len(sheet.cells)}, {rows} outputs read")
+    print(
+        f"first read:            {first:.3f}s, {sheet.evaluation_count} cells computed"
+    )
+
+    # inputs of the branch not taken: nothing downstream is invalidated
+    invalidated = sheet.invalidation_count
+    start = time.perf_counter()
+    for row in range(1, rows + 1, 100):
+        sheet.set_cell(f"D{row}", "7")
+    edit = time.perf_counter() - start
+    again = read_outputs(sheet, rows)
+    print(
+        f"edit untaken inputs:   {edit:.3f}s, "
+        f"{sheet.invalidation_count - invalidated} cells invalidated, "
+        f"re-read {again:.3f}s"
+    )
+
+    # the condition flips on one row: that row now reads the other branch
+    sheet.set_cell("A10", "0")
+    evaluated = sheet.evaluation_count
+    start = time.perf_counter()
+    sheet.get_cell_value("E10")
+    flip = time.perf_counter() - start
+    print(
+        f"flip one condition:    {flip:.4f}s, "
+        f"{sheet.evaluation_count - evaluated} cells computed"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_dynamic_deps.py
@@ -0,0 +1,35 @@
+import sys
+import time
+import tracemalloc
+
+from sheet_engine.Expression import Expression
+from sheet_engine.parse_cache import parse_cache
+
+
+def build(rows: int, shared: bool) -> tuple[float, int]:
+    parse_cache.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    cells = {}
+    for row in range(1, rows + 1):
+        name = f"C{row}"
+        expr = f"=A{row}*B{row}+Max(A{row}, B{row}, 10)"
+        cells[name] = Expression(expr, name) if shared else Expression(expr)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(rows: int = 20_000) -> None:
+    for shared in (False, True):
+        elapsed, peak = build(rows, shared)
+        label = "shared template" if shared else "tree per cell"
+        print(f"{label:>16}: {elapsed:.3f}s, peak {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_fill_down.py
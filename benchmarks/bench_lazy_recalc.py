@@ -0,0 +1,52 @@
+import sys
+import time
+
+from sheet_engine.scheduler import RecalcScheduler
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int) -> Spreadsheet:
+    # every cell of columns B and C depends on A1
+    sheet = Spreadsheet()
+    cells = {"A1": "1"}
+    for row in range(1, rows + 1):
+        cells[f"B{row}"] = f"=A1*{row}"
+        cells[f"C{row}"] = f"=B{row}+A1"
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+def main(rows: int = 100_000, budget: int = 500) -> None:
+    sheet = build(rows)
+    sheet.set_cell("A1", "2")
+    start = time.perf_counter()
+    sheet.recalculate()
+    print(f"eager: {time.perf_counter() - start:.3f}s before anything can be shown")
+
+    sheet = build(rows)
+    scheduler = RecalcScheduler(sheet)
+    sheet.set_cell("A1", "2")
+    scheduler.set_visible(f"{col}{row}" for col in "ABC" for row in range(1, 41))
+    start = time.perf_counter()
+    scheduler.step(budget)
+    first = time.perf_counter() - start
+    longest = 0.0
+    steps = 1
+    while not scheduler.done:
+        step_start = time.perf_counter()
+        scheduler.step(budget)
+        longest = max(longest, time.perf_counter() - step_start)
+        steps += 1
+    total = time.perf_counter() - start
+    print(
+        f"scheduled: visible cells after {first * 1000:.1f}ms, longest step "
+        f"{longest * 1000:.1f}ms, {steps} steps, {total:.3f}s in all"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_lazy_recalc.py
@@ -0,0 +1,41 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build_chain(length: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    # set from the bottom up so building stays linear
+    for row in range(length, 1, -1):
+        sheet.set_cell(f"A{row}", f"=A{row - 1}+1")
+    sheet.set_cell("A1", "1")
+    return sheet
+
+
+def main(length: int = 100_000) -> None:
+    start = time.perf_counter()
+    sheet = build_chain(length)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert sheet.get_cell_value(f"A{length}") == length
+    first_time = time.perf_counter() - start
+
+    sheet.set_cell("A1", "2")
+    sheet.evaluation_count = 0
+    start = time.perf_counter()
+    assert sheet.get_cell_value(f"A{length}") == length + 1
+    recalc_time = time.perf_counter() - start
+
+    print(f"chain length:      {length}")
+    print(f"build:             {build_time:.3f}s")
+    print(f"first evaluation:  {first_time:.3f}s")
+    print(f"recalc after edit: {recalc_time:.3f}s ({sheet.evaluation_count} cells)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_long_chain.py 1000000
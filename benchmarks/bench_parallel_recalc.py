@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int, workers: int) -> Spreadsheet:
+    # a wide sheet: every row reads the same input, each column is one level
+    sheet = Spreadsheet(workers=workers)
+    cells = {"A1": "3"}
+    for row in range(1, rows + 1):
+        cells[f"B{row}"] = f"=(A1*{row}+{row}/A1-2)*(A1-{row})+Max(A1, {row})^2"
+        cells[f"C{row}"] = f"=B{row}*B{row}-B{row}/7+Min(B{row}, A1)"
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+def main(rows: int = 10_000, rounds: int = 3) -> None:
+    print(f"{os.cpu_count()} cpus, {2 * rows} dirty cells per recalc")
+    base = None
+    for workers in (1, 2, 4, 8):
+        sheet = build(rows, workers)
+        start = time.perf_counter()
+        for i in range(rounds):
+            sheet.set_cell("A1", str(i + 4))
+            sheet.recalculate()
+        elapsed = (time.perf_counter() - start) / rounds
+        sheet.close()
+        base = base or elapsed
+        print(f"{workers} workers: {elapsed:.3f}s per recalc ({base / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_parallel_recalc.py
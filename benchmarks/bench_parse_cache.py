@@ -0,0 +1,30 @@
+import sys
+import time
+
+from sheet_engine.parse_cache import parse_cache
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def load(rows: int) -> float:
+    sheet = Spreadsheet()
+    start = time.perf_counter()
+    for row in range(1, rows + 1):
+        sheet.set_cell(f"A{row}", str(row % 10))
+        # the same few formulas repeated, like a block of copied totals
+        sheet.set_cell(f"B{row}", f"=If(A{row % 50 + 1}>5, A1*2, Sum(A2, A3, 7))")
+    return time.perf_counter() - start
+
+
+def main(rows: int = 50_000) -> None:
+    for size in (0, 4096):
+        parse_cache.clear()
+        parse_cache.resize(size)
+        elapsed = load(rows)
+        print(f"cache size {size:>5}: {elapsed:.3f}s  {parse_cache}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_parse_cache.py
@@ -0,0 +1,30 @@
+import sys
+import time
+
+from sheet_engine.parser import parse_tokens
+from sheet_engine.tokenizer import tokenize
+
+
+def nested(depth: int) -> str:
+    # If(A1, Sum(1, If(A1, Sum(1, ... 2), 0)), 0), two calls per level
+    return "If(A1, Sum(1, B1+" * depth + "2" + "), 0)" * depth
+
+
+def main(depth: int = 200, rounds: int = 50) -> None:
+    for size in (depth // 4, depth // 2, depth):
+        tokens = tokenize(nested(size))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            parse_tokens(tokens)
+        elapsed = (time.perf_counter() - start) / rounds
+        print(
+            f"depth {size:>4} ({len(tokens)} tokens): {elapsed * 1000:6.2f} ms, "
+            f"{elapsed / len(tokens) * 1e9:5.0f} ns/token"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+
+
+# PYTHONPATH=src python benchmarks/bench_parser.py
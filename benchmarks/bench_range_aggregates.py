@@ -0,0 +1,46 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for row in range(1, rows + 1):
+        sheet.set_cell(f"A{row}", str(row % 1000))
+    sheet.set_cell("B1", f"=Sum(A1:A{rows})")
+    sheet.set_cell("B2", f"=Max(A1:A{rows})")
+    sheet.set_cell("B3", f"=Min(A1:A{rows})")
+    sheet.recalculate()
+    return sheet
+
+
+def edit_time(sheet: Spreadsheet, rows: int, edits: int, incremental: bool) -> float:
+    start = time.perf_counter()
+    for i in range(edits):
+        if not incremental:
+            # what every edit cost before: re-read the whole range
+            sheet.range_values.clear()
+            sheet.range_changes.clear()
+        sheet.set_cell(f"A{i * 7919 % rows + 1}", str(i))
+        sheet.recalculate()
+    return time.perf_counter() - start
+
+
+def main(rows: int = 1_000_000, edits: int = 20) -> None:
+    start = time.perf_counter()
+    sheet = build(rows)
+    print(f"built {rows} rows in {time.perf_counter() - start:.1f}s")
+
+    full = edit_time(sheet, rows, edits, incremental=False)
+    incremental = edit_time(sheet, rows, edits, incremental=True)
+    print(f"full re-read: {full / edits * 1000:.3f} ms/edit")
+    print(f"incremental:  {incremental / edits * 1000:.3f} ms/edit")
+    print(f"speedup:      {full / incremental:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_range_aggregates.py
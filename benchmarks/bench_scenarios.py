@@ -0,0 +1,70 @@
+import random
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def cells(rows: int) -> dict:
+    # inputs, per-row formulas, a running total and a few outputs over whole columns
+    result = {}
+    for row in range(1, rows + 1):
+        result[f"A{row}"] = str(row % 100)
+        result[f"B{row}"] = f"=A{row}*3+{row % 7}"
+        result[f"C{row}"] = f"=If(B{row}>150, B{row}-A{row}, A{row})"
+        result[f"E{row}"] = f"=E{row - 1}+C{row}" if row > 1 else "=C1"
+    result["D1"] = f"=Sum(C1:C{rows})"
+    result["D2"] = f"=Max(B1:B{rows})"
+    result["D3"] = f"=D1-D2-E{rows}"
+    return result
+
+
+def scenarios(rows: int, count: int) -> list[dict]:
+    rng = random.Random(1)
+    return [
+        {f"A{rng.randint(1, rows)}": str(rng.randint(0, 999)) for _ in range(3)}
+        for _ in range(count)
+    ]
+
+
+def main(rows: int = 20_000, count: int = 20) -> None:
+    source = cells(rows)
+    runs = scenarios(rows, count)
+    outputs = ["D1", "D2", "D3"]
+
+    sheet = Spreadsheet()
+    sheet.set_cells(source)
+    sheet.recalculate()
+    # baseline: edit, read, then set the old inputs back and recalculate
+    start = time.perf_counter()
+    reverted = []
+    for edits in runs:
+        old = {name: sheet.cells[name].expr for name in edits}
+        sheet.set_cells(edits)
+        reverted.append({name: sheet.get_cell_value(name) for name in outputs})
+        sheet.set_cells(old)
+        sheet.recalculate()
+    revert = time.perf_counter() - start
+
+    before = dict(sheet.values)
+    evaluations = sheet.evaluation_count
+    start = time.perf_counter()
+    results = sheet.evaluate_scenarios(runs, outputs)
+    scenario = time.perf_counter() - start
+    assert results == reverted
+    assert sheet.values == before
+
+    print(f"cells:                 {len(source)}, {count} scenarios of 3 inputs")
+    print(f"set_cells and revert:  {revert:.2f}s ({count / revert:,.0f}/s)")
+    print(
+        f"evaluate_scenarios:    {scenario:.2f}s ({count / scenario:,.0f}/s, "
+        f"{revert / scenario:.1f}x), "
+        f"{(sheet.evaluation_count - evaluations) / count:.0f} evaluations each"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_scenarios.py
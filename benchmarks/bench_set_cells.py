@@ -0,0 +1,41 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def cells(rows: int) -> dict:
+    sheet = {}
+    for row in range(1, rows + 1):
+        sheet[f"A{row}"] = str(row)
+        sheet[f"B{row}"] = f"=A{row}*2+B{max(row - 1, 1)}" if row > 1 else "=A1"
+        sheet[f"C{row}"] = f"=Sum(A{row}:B{row})"
+    return sheet
+
+
+def main(rows: int = 50_000) -> None:
+    for size in (rows // 4, rows // 2, rows):
+        data = cells(size)
+
+        sheet = Spreadsheet()
+        start = time.perf_counter()
+        for name, expr in data.items():
+            sheet.set_cell(name, expr)
+        single = time.perf_counter() - start
+
+        sheet = Spreadsheet()
+        start = time.perf_counter()
+        sheet.set_cells(data)
+        bulk = time.perf_counter() - start
+
+        print(
+            f"{len(data):>7} cells: set_cell {single:6.2f}s, set_cells {bulk:6.2f}s "
+            f"({len(data) / bulk:,.0f} cells/s, {single / bulk:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_set_cells.py
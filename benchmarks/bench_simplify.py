@@ -0,0 +1,76 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int, simplify_formulas: bool, compile_formulas: bool) -> Spreadsheet:
+    # a filled-down formula as people write it: unit conversions spelled out,
+    # repeated terms and a switch that is really a constant
+    sheet = Spreadsheet(
+        simplify_formulas=simplify_formulas, compile_formulas=compile_formulas
+    )
+    cells = {}
+    for row in range(1, rows + 1):
+        cells[f"A{row}"] = "3"
+        cells[f"B{row}"] = str(row)
+        cells[f"C{row}"] = (
+            f"=B{row}*(60*60*24)+A{row}+A{row}+B{row}+B{row}+(2^10-24)"
+            f"+If(1>0, B{row}*(1000/1000*3), Max(B{row}, A{row}, 7*7))"
+        )
+    sheet.set_cells(cells)
+    return sheet
+
+
+def recalc_time(sheet: Spreadsheet, rounds: int) -> float:
+    # every input changed, the recalculation alone is timed
+    total = 0.0
+    for i in range(rounds):
+        sheet.set_cells({name: str(i + 2) for name in sheet.cells if name[0] == "A"})
+        start = time.perf_counter()
+        sheet.recalculate()
+        total += time.perf_counter() - start
+    return total
+
+
+def evaluate_time(sheet: Spreadsheet, rounds: int) -> float:
+    # formula evaluation alone, without the recalc bookkeeping around it
+    cells = [
+        (expr, sheet._generate_values(name))
+        for name, expr in sheet.cells.items()
+        if expr.tree is not None
+    ]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for expr, value_dict in cells:
+            expr.evaluate(value_dict, sheet.compile_formulas, sheet.simplify_formulas)
+    return time.perf_counter() - start
+
+
+def main(rows: int = 20_000, rounds: int = 5) -> None:
+    results = {}
+    for compile_formulas in (False, True):
+        for simplify_formulas in (False, True):
+            sheet = build(rows, simplify_formulas, compile_formulas)
+            sheet.recalculate()
+            results[simplify_formulas] = (
+                recalc_time(sheet, rounds),
+                evaluate_time(sheet, rounds),
+                sheet,
+            )
+        plain, simple = results[False], results[True]
+        assert plain[2].values == simple[2].values
+        label = "compiled" if compile_formulas else "tree walk"
+        print(
+            f"{label:>10}: recalc {plain[0]:.3f}s -> {simple[0]:.3f}s simplified "
+            f"({plain[0] / simple[0]:.2f}x), evaluate only {plain[1]:.3f}s -> "
+            f"{simple[1]:.3f}s ({plain[1] / simple[1]:.2f}x)"
+        )
+    print(f"{rounds} rounds of {rows} cells")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_simplify.py
@@ -0,0 +1,30 @@
+import sys
+import time
+
+from sheet_engine.tokenizer import tokenize
+
+
+def formula(tokens: int) -> str:
+    # cells, ranges, ints, strings and calls, about 20 tokens per term
+    term = "Max(A1, 10) + Sum(B2:C9, 3) * D4 - Concat('x', E5) / 7 + "
+    return (term * (tokens // 20 + 1)) + "1"
+
+
+def main(tokens: int = 10_000, rounds: int = 20) -> None:
+    for size in (tokens, 2 * tokens, 4 * tokens):
+        expr = formula(size)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            count = len(tokenize(expr))
+        elapsed = (time.perf_counter() - start) / rounds
+        print(
+            f"{count:>7} tokens ({len(expr)} chars): {elapsed * 1000:7.2f} ms, "
+            f"{elapsed / count * 1e9:5.0f} ns/token"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_tokenizer.py
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+from sheet_engine_ui.spread_sheet_app import SpreadsheetApp
+
+
+def build(count: int) -> Spreadsheet:
+    # diamonds: every C cell reads two B cells, both reading A1, so the old
+    # per-path repaint reached each C cell twice
+    sheet = Spreadsheet()
+    cells = {"A1": "1"}
+    half = count // 2
+    for row in range(1, half + 1):
+        cells[f"B{row}"] = f"=A1*{row}"
+        cells[f"C{row}"] = f"=B{row}+B{half + 1 - row}"
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+async def edit(count: int, rounds: int) -> None:
+    app = SpreadsheetApp(build(count))
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        total = 0.0
+        for i in range(rounds):
+            app.grid.cursor = (0, 0)
+            await pilot.press("enter")
+            app.input.value = str(i + 2)
+            start = time.perf_counter()
+            await pilot.press("enter")
+            while not app.scheduler.done:
+                await pilot.pause()
+            await pilot.wait_for_scheduled_animations()
+            total += time.perf_counter() - start
+        print(
+            f"{count} dependents: {total / rounds * 1000:.1f}ms from submit to repainted"
+        )
+
+
+def main(count: int = 10_000, rounds: int = 5) -> None:
+    asyncio.run(edit(count, rounds))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_ui_repaint.py
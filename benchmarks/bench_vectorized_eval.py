@@ -0,0 +1,48 @@
+import sys
+import time
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(rows: int, vectorize: bool) -> Spreadsheet:
+    # three fill-down formula columns over two input columns
+    sheet = Spreadsheet(vectorize=vectorize)
+    cells = {}
+    for n in range(1, rows + 1):
+        cells[f"A{n}"] = str(n % 97)
+        cells[f"B{n}"] = str(n % 13 + 1)
+        cells[f"C{n}"] = f"=A{n}*B{n}+1"
+        cells[f"D{n}"] = f"=If(C{n}>50, C{n}/B{n}, A{n}^2-B{n})"
+        cells[f"E{n}"] = (
+            f"=(C{n}-A{n})*(C{n}+B{n})/(B{n}+1)+Max(C{n}, A{n}+B{n})^2-D{n}"
+        )
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+def main(rows: int = 100_000, rounds: int = 3) -> None:
+    base = None
+    for vectorize in (False, True):
+        sheet = build(rows, vectorize)
+        elapsed = 0.0
+        for i in range(rounds):
+            # a full-column paste, only the recalc is timed
+            sheet.set_cells({f"A{n}": str((n + i) % 89) for n in range(1, rows + 1)})
+            start = time.perf_counter()
+            sheet.recalculate()
+            elapsed += time.perf_counter() - start
+        elapsed /= rounds
+        base = base or elapsed
+        label = "vectorized" if vectorize else "per cell"
+        print(
+            f"{label}: {elapsed:.3f}s per recalc of {3 * rows} formulas "
+            f"({base / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_vectorized_eval.py
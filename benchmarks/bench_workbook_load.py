@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import time
+
+from sheet_engine import workbook
+from sheet_engine.parse_cache import parse_cache
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def cells(rows: int) -> dict:
+    # inputs, a fill-down column, one-off formulas and a running range total
+    result = {}
+    for row in range(1, rows + 1):
+        result[f"A{row}"] = str(row)
+        result[f"B{row}"] = f"=A{row}*2+1"
+        result[f"C{row}"] = f"=If(B{row}>{row % 97}, A{row}-{row}, Max(A{row}, 3))"
+        result[f"D{row}"] = f"=Sum(A1:A{row % 50 + 1})+C{row}"
+    return result
+
+
+def main(rows: int = 50_000) -> None:
+    source = cells(rows)
+
+    parse_cache.clear()
+    start = time.perf_counter()
+    sheet = Spreadsheet()
+    for name, expr in source.items():
+        sheet.set_cell(name, expr)
+    replay = time.perf_counter() - start
+    sheet.recalculate()
+    replay_values = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), "book.sheet")
+    start = time.perf_counter()
+    workbook.save(sheet, path)
+    saved = time.perf_counter() - start
+
+    parse_cache.clear()
+    start = time.perf_counter()
+    loaded = workbook.load(path)
+    load = time.perf_counter() - start
+    assert loaded.values == sheet.values
+    assert parse_cache.misses == 0
+
+    print(f"cells:                 {len(source)}")
+    print(
+        f"file size:             {os.path.getsize(path) / 1e6:.1f} MB (save {saved:.2f}s)"
+    )
+    print(f"replay set_cell:       {replay:.2f}s, {replay_values:.2f}s with values")
+    print(
+        f"workbook.load:         {load:.2f}s with values ({replay_values / load:.1f}x)"
+    )
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
+
+
+# PYTHONPATH=src python benchmarks/bench_workbook_load.py
@@ -1,7 +1,10 @@
 import re
 from enum import Enum, auto
-from .parser import parse_expr
-from .formula import Formula
+from .parse_cache import parse_cache
+from .formula import Formula, conditional_dependencies
+from .compiler import compile_formula
+from .optimizer import simplify
+from .cell_ref import is_cell_name
 
 
 class ExpressionType(Enum):
@@ -12,12 +15,28 @@ class ExpressionType(Enum):
 
 
 class Expression:
-    def __init__(self, expr):
+    def __init__(self, expr, name=None, template=None):
         self.expr = expr
-        self.expr_type = self._determine_type()
-        self.tree = (
-            self._parse_expr() if self.expr_type == ExpressionType.FORMULA else None
-        )
+        if template is not None:
+            self.expr_type = ExpressionType.FORMULA
+        else:
+            self.expr_type = self._determine_type()
+        self.template = None
+        self.offset = (0, 0)  # (col, row) shift from the template's origin cell
+        self._compiled = None
+        self._dep_names = None  # template dependencies shifted to this cell
+        if self.expr_type != ExpressionType.FORMULA:
+            self.tree = None
+        elif template is not None:
+            # (template, offset) already parsed, e.g. read back by workbook.load
+            self.template, self.offset = template
+            self.tree = self.template.tree
+        elif name is None or not is_cell_name(name):
+            self.tree = self._parse_expr()
+        else:
+            # cells filled down/across share one template tree
+            self.template, self.offset = parse_cache.template(self.expr[1:], name)
+            self.tree = self.template.tree
 
     def _determine_type(self):
         if self.expr.startswith("="):
@@ -28,7 +47,7 @@ class Expression:
             return ExpressionType.ERROR
         return ExpressionType.LITERAL
 
-    def evaluate(self, value_dict):
+    def evaluate(self, value_dict, compiled=False, simplified=False):
         if self.expr_type == ExpressionType.INTEGER:
             return int(self.expr)
         if self.expr_type == ExpressionType.LITERAL:
@@ -36,15 +55,78 @@ class Expression:
         if self.expr_type == ExpressionType.ERROR:
             return self.expr
 
+        if self.offset != (0, 0):
+            # the tree names cells relative to the template origin, map them to ours
+            value_dict = {
+                tree_name: value_dict[name]
+                for tree_name, name in zip(self.template.names, self._shifted_names())
+            }
+
+        # the simplified tree reads a subset of the names the parsed one does
+        if compiled:
+            if self._compiled is None:
+                tree = simplify(self.tree) if simplified else self.tree
+                self._compiled = compile_formula(tree)
+            return self._compiled(value_dict)
+
         def get_val(name):
             return value_dict[name]
 
-        return self.tree.evaluate(get_val)
+        tree = simplify(self.tree) if simplified else self.tree
+        return tree.evaluate(get_val)
+
+    def evaluate_lazy(self, get_value, compiled=False, simplified=False):
+        # like evaluate, but each cell is read through get_value(name) only when the
+        # evaluation gets to it, so an If branch not taken reads nothing
+        if self.offset != (0, 0):
+            shifted = dict(zip(self.template.names, self._shifted_names()))
+            read = get_value
+
+            def get_value(tree_name):
+                return read(shifted[tree_name])
+
+        tree = simplify(self.tree) if simplified else self.tree
+        if compiled:
+            if self._compiled is None:
+                self._compiled = compile_formula(tree)
+            return self._compiled(_Reader(get_value))
+        return tree.evaluate(get_value)
+
+    def get_conditional_dependencies(self) -> set:
+        # the dependencies only read inside an If branch
+        if self.expr_type != ExpressionType.FORMULA:
+            return set()
+        if self.template is None:
+            return conditional_dependencies(self.tree)
+        conditional = self.template.conditional
+        if not conditional:
+            return conditional
+        return {
+            name
+            for tree_name, name in zip(self.template.names, self._shifted_names())
+            if tree_name in conditional
+        }
 
     def get_dependencies(self) -> set:
-        if self.expr_type == ExpressionType.FORMULA:
-            return self.tree.get_dependencies()
-        return set()
+        if self.expr_type != ExpressionType.FORMULA:
+            return set()
+        if self.template is not None:
+            return set(self._shifted_names())
+        return self.tree.get_dependencies()
+
+    def _shifted_names(self) -> list[str]:
+        if self._dep_names is None:
+            self._dep_names = self.template.shifted_names(self.offset)
+        return self._dep_names
 
     def _parse_expr(self) -> Formula:
-        return parse_expr(self.expr[1:])
+        return parse_cache.parse(self.expr[1:])
+
+
+class _Reader:
+    # values[name] for compiled formulas, fetched as they are read
+    def __init__(self, get_value):
+        self.get_value = get_value
+
+    def __getitem__(self, name):
+        return self.get_value(name)
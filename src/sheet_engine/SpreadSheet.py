@@ -1,73 +1,487 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
 from .Expression import Expression
+from .columnar import ColumnarValues
+from .parallel import recalculate_levels
+from .cell_ref import col_name, is_cell_name, is_range, range_bounds, split_name
+from .range_index import RangeIndex
+from .range_values import RangeValues
+from .recalc import find_cycles, topological_order
+from .snapshot import Snapshot
+from .topo_order import TopologicalOrder
+from .vectorize import recalculate_blocks
 
 
 # ToDo
 # fix the ErrorFormula logic handeling
-# fast name to key func
 # copy paste
+# key cells, values, deps and rev_deps by cell_key() ints, names only at the api
 
 
 class Spreadsheet:
-    def __init__(self):  # (col,row)
+    def __init__(
+        self,
+        compile_formulas: bool = False,
+        simplify_formulas: bool = False,
+        columnar: bool = False,
+        workers: int = 0,
+        vectorize: bool = False,
+    ):  # (col,row)
         self.cells = {}  # stores expr obj
-        self.values = {}
+        # columnar keeps numbers in per-column arrays, for sheets with millions of values
+        self.values = ColumnarValues() if columnar else {}
         # reverse dependency dict- if key changes value, all items in set its holding must change
         self.rev_deps = {}
         self.deps = {}
+        # ranges (A1:B100) are graph nodes of their own, found through the index
+        # instead of adding every cell they cover to deps/rev_deps
+        self.ranges = RangeIndex()
+        # a range value is kept after invalidation and only its changed members are re-read
+        self.range_values = {}
+        self.range_changes = {}
+        # the deps a cell read for its cached value, kept when an If skipped some of
+        # them: only a change to these invalidates it
+        self.reads = {}
+        self.order = TopologicalOrder(self._dependents, self._predecessors)
+        # invalidated cells not recomputed yet, by recalculate() or a read
+        self.dirty = set()
+        self.compile_formulas = compile_formulas  # see compiler.compile_formula
+        self.simplify_formulas = simplify_formulas  # see optimizer.simplify
+        # recalculate() on this many worker processes, see parallel.recalculate_levels
+        self.workers = workers
+        self._pool = None
+        # recalculate() fill-down blocks as numpy arrays, see vectorize.recalculate_blocks
+        self.vectorize = vectorize
+        self._batch = None  # edits buffered by batch(), name -> expr
+        self._batch_depth = 0
+        self._snapshot = None  # the active snapshot(), recording what edits change
         self.evaluation_count = 0  # for testing
+        self.invalidation_count = 0  # cells visited while invalidating, for testing
 
     def set_cell(self, name: str, expr: str) -> None:
+        if self._batch is not None:
+            self._batch[name] = expr
+            return
         try:
-            self._clear_dependent_values(name)
-            self._update_deps(name, expr)
-            expr_obj = Expression(expr)
+            self._clear_dependent_values([name])
+            # parse once, the same object feeds deps, cycle check and storage
+            expr_obj = Expression(expr, name)
+            self._update_deps(name, expr_obj)
             self.cells[name] = expr_obj
         except ValueError as e:
             self.cells[name] = Expression(str(e))
 
+    def set_cells(self, cells) -> list[str]:
+        # bulk version of set_cell for a mapping or (name, expr) pairs: one invalidation,
+        # one pass over the dependencies and one cycle search for the whole batch.
+        # every edited cell on a cycle gets the circular error, those cells are returned
+        cells = dict(cells)
+        if self._batch is not None:
+            self._batch.update(cells)
+            return []
+        return self._set_cells(cells)
+
+    def _set_cells(self, cells: dict, acyclic: bool = False) -> list[str]:
+        # acyclic: the caller knows the edits close no cycle (restore() putting back
+        # an earlier state), so the cycle search is skipped
+        if not cells:
+            return []
+        self._clear_dependent_values(cells)
+
+        exprs = {}
+        for name, expr in cells.items():
+            try:
+                exprs[name] = Expression(expr, name)
+            except ValueError as e:
+                exprs[name] = Expression(str(e))
+
+        new_cells = [name for name in exprs if name not in self.deps]
+        new_ranges = []
+        released = set()
+        for name, expr_obj in exprs.items():
+            old_deps = self.deps.get(name, set())
+            for dep in old_deps:
+                self.rev_deps.get(dep, set()).discard(name)
+            dependencies = expr_obj.get_dependencies()
+            for dep in dependencies:
+                if is_range(dep) and dep not in self.ranges:
+                    self.ranges.add(dep)
+                    new_ranges.append(dep)
+                self.rev_deps.setdefault(dep, set()).add(name)
+            self.deps[name] = dependencies
+            self.cells[name] = expr_obj
+            released |= old_deps - dependencies
+        for dep in released:
+            self._release_range(dep)
+
+        if self._appends_in_order(exprs, new_ranges):
+            # e.g. rows streamed in from a file: adding the cells in batch order keeps
+            # the order valid without a reorder, and there is no edge to close a cycle
+            for name in exprs:
+                self.order.add_node(name)
+                for dep in self.deps[name]:
+                    self.order.add_edge(dep, name)
+            return []
+
+        if len(exprs) * 4 >= len(self.order.index):
+            # a big batch: sorting the whole graph once beats fixing the order edge by edge,
+            # and the sort tells whether there is a cycle to look for at all
+            try:
+                self._rebuild_order()
+                return []
+            except ValueError:
+                broken = self._break_cycles(exprs)
+                self._rebuild_order()
+                return broken
+
+        broken = [] if acyclic else self._break_cycles(exprs)
+        # every end of the new edges is indexed before the first one is added: a
+        # reorder walks deps/rev_deps, which already hold the whole batch
+        for name in new_ranges:
+            if name in self.ranges:
+                self.order.add_node(name)
+        for name in new_cells:
+            self.order.add_node(name)
+        for name in exprs:
+            for dep in self.deps[name]:
+                self.order.add_source(dep)
+        for name in new_cells:
+            for range_name in self.ranges.containing(name):
+                self.order.add_edge(name, range_name)
+        for name in exprs:
+            for dep in self.deps[name]:
+                self.order.add_edge(dep, name)
+        return broken
+
+    @contextmanager
+    def batch(self):
+        # with sheet.batch(): buffers set_cell/set_cells and applies them together on exit,
+        # followed by one recalculate(). reads inside the block still see the old values.
+        # if the edits close a cycle none of them are kept and ValueError is raised
+        self._batch_depth += 1
+        if self._batch is None:
+            self._batch = {}
+        try:
+            yield self
+        except BaseException:
+            if self._batch_depth == 1:
+                self._batch = None
+            raise
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._commit_batch()
+
+    def _commit_batch(self) -> None:
+        edits = self._batch
+        self._batch = None
+        old = {name: self.cells.get(name) for name in edits}
+        if self.set_cells(edits):
+            # roll back: old formulas again, cells the batch created removed
+            self.set_cells({name: expr.expr for name, expr in old.items() if expr})
+            for name, expr in old.items():
+                if expr is None:
+                    self._remove_cell(name)
+            raise ValueError("#ERROR Circular dependency detected")
+        try:
+            self.recalculate()
+        except (ArithmeticError, TypeError):
+            # the edits are in, a formula that can't be computed raises when it is read
+            pass
+
+    def snapshot(self) -> Snapshot:
+        # start recording edits so restore() can undo them. nothing is copied, the
+        # snapshot fills up as cells are invalidated
+        if self._snapshot is not None:
+            raise ValueError("#ERROR A snapshot is already active")
+        self._snapshot = Snapshot()
+        return self._snapshot
+
+    def restore(self, snapshot: Snapshot) -> None:
+        # back to the state at snapshot(): the old formulas are set again, then the old
+        # values put back instead of recomputed. ranges re-read only their changed cells
+        if snapshot is not self._snapshot:
+            raise ValueError("#ERROR Snapshot is not active")
+        self._snapshot = None
+        self._set_cells(
+            {name: expr.expr for name, expr in snapshot.cells.items() if expr},
+            acyclic=True,
+        )
+        for name, expr in snapshot.cells.items():
+            if expr is None and name in self.cells:
+                self._remove_cell(name)
+        ranges = []
+        for name, value in snapshot.values.items():
+            if is_range(name):
+                ranges.append(name)
+            else:
+                self.values[name] = value
+                self.dirty.discard(name)
+        for name in ranges:
+            if name in self.ranges:
+                self.get_cell_value(name)
+
+    def evaluate_scenarios(self, scenarios, outputs) -> list[dict]:
+        # scenarios is an iterable of edits as set_cells takes them. each one is applied
+        # to the sheet, the outputs are read (computing only what they depend on) and
+        # the edits are undone, so all scenarios share the rest of the graph and values
+        results = []
+        for edits in scenarios:
+            snapshot = self.snapshot()
+            try:
+                self.set_cells(edits)
+                results.append({name: self.get_cell_value(name) for name in outputs})
+            finally:
+                self.restore(snapshot)
+        return results
+
+    def _remove_cell(self, name: str) -> None:
+        self._clear_dependent_values([name])
+        self.dirty.discard(name)
+        for dep in self.deps.pop(name, set()):
+            self.rev_deps[dep].discard(name)
+            self._release_range(dep)
+        del self.cells[name]
+        for range_name in self.ranges.containing(name):
+            # the range lost a member, rebuild it
+            self.range_values.pop(range_name, None)
+            self.range_changes.pop(range_name, None)
+        if not self.rev_deps.get(name):
+            self.order.discard(name)
+
+    def _appends_in_order(self, exprs: dict, new_ranges: list) -> bool:
+        # every cell is new to the order and outside all ranges, and reads only cells
+        # outside the batch or before it in the batch
+        if new_ranges:
+            return False
+        seen = set()
+        for name in exprs:
+            if name in self.order.index:
+                return False
+            if self.ranges and self.ranges.containing(name):
+                return False
+            for dep in self.deps[name]:
+                if dep in exprs and dep not in seen:
+                    return False
+            seen.add(name)
+        return True
+
+    def _break_cycles(self, exprs: dict) -> list[str]:
+        # every cycle runs through an edited cell, and only its deps lead into it,
+        # so dropping the deps of the edited cells on a cycle breaks them all
+        broken = []
+        for cycle in find_cycles(exprs, self._dependents):
+            for name in cycle:
+                if name not in exprs:
+                    continue
+                broken.append(name)
+                print(f"#ERROR in cell {name}: #ERROR Circular dependency detected")
+                old_deps = self.deps[name]
+                for dep in old_deps:
+                    self.rev_deps[dep].discard(name)
+                self.deps[name] = set()
+                self.cells[name] = Expression("#ERROR Circular dependency detected")
+                for dep in old_deps:
+                    self._release_range(dep)
+        return broken
+
     def get_cell_expr(self, name: str) -> str:
         return self.cells.get(name, "")
 
     def get_cell_value(self, name: str) -> int | float:
-
         if name in self.values:
             return self.values[name]
 
-        self.evaluation_count += 1
-        expr = self.cells.get(name)
+        # explicit work stack instead of recursion so long chains can't hit the recursion limit
+        stack = [name]
+        while stack:
+            current = stack[-1]
+            if current in self.values:
+                stack.pop()
+                continue
 
-        if expr is None:
-            self.values[name] = f"#ERROR: Cell {name} not found"
-            return self.values[name]
+            if is_range(current):
+                range_value = self.range_values.get(current)
+                if range_value is None:
+                    needed = self._range_members(current)
+                else:
+                    needed = self.range_changes[current]
+                pending = [cell for cell in needed if cell not in self.values]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                if range_value is None:
+                    range_value = RangeValues(
+                        needed, [self.values[cell] for cell in needed]
+                    )
+                    self.range_values[current] = range_value
+                    self.range_changes[current] = set()
+                else:
+                    for cell in needed:
+                        range_value.update(cell, self.values[cell])
+                    needed.clear()
+                self.values[current] = range_value
+                self.dirty.discard(current)
+                stack.pop()
+                continue
 
-        value_dict = self._generate_values(expr)
-        value = expr.evaluate(value_dict)
-        self.values[name] = value
-        return value
+            expr = self.cells.get(current)
+            if expr is None:
+                self.evaluation_count += 1
+                self.values[current] = f"#ERROR: Cell {current} not found"
+                self.dirty.discard(current)
+                stack.pop()
+                continue
 
-    def _clear_dependent_values(self, name: str) -> None:
-        if name in self.values:
-            self.values.pop(name)
-        # recursively remove all values dependent
-        for dependent in self.rev_deps.get(name, set()):
-            self._clear_dependent_values(dependent)
+            deps = self.deps.get(current, ())
+            pending = [dep for dep in deps if dep not in self.values]
+            # cells only an If branch reads are fetched once the evaluation takes it
+            template = expr.template
+            if template is None or template.conditional:
+                conditional = expr.get_conditional_dependencies()
+                if conditional:
+                    pending = [dep for dep in pending if dep not in conditional]
+            else:
+                conditional = None
+            if pending:
+                stack.extend(pending)
+                continue
 
-    def _update_deps(self, name: str, expr: str) -> None:
-        try:
+            if conditional:
+                read = set()
+                try:
+                    value = expr.evaluate_lazy(
+                        partial(self._read, read),
+                        self.compile_formulas,
+                        self.simplify_formulas,
+                    )
+                except _Unread as unread:
+                    # compute the cell the branch needs, then evaluate again
+                    stack.append(unread.name)
+                    continue
+                if len(read) < len(deps):
+                    self.reads[current] = read
+                self.evaluation_count += 1
+                self.values[current] = value
+            else:
+                self.evaluation_count += 1
+                value_dict = self._generate_values(current)
+                self.values[current] = expr.evaluate(
+                    value_dict, self.compile_formulas, self.simplify_formulas
+                )
+            self.dirty.discard(current)
+            stack.pop()
+
+        return self.values[name]
+
+    def recalculate(self) -> list[str]:
+        # recompute every dirty cell exactly once, dependencies first
+        # cells leave the dirty set as they are computed: one whose formula raises stays
+        # dirty, like the cells reading it, the others are still computed and the first
+        # error is raised at the end
+        order = topological_order(self.dirty, self._dependents)
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            recalculate_levels(self, order, self._pool, self.workers)
+        elif self.vectorize:
+            recalculate_blocks(self, order)
+        error = None
+        for name in order:
+            try:
+                self.get_cell_value(name)
+            except (ArithmeticError, TypeError) as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return [name for name in order if not is_range(name)]
+
+    def close(self) -> None:
+        # stop the recalculate() worker processes, if any were started
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
 
+    def _clear_dependent_values(self, names) -> None:
+        # remove the values of names and every value dependent on them, visiting each cell once.
+        # a dependent can only be cached if everything it reads is, so the walk stops at uncached cells
+        new_cells = {name for name in names if name not in self.cells}
+        reads = self.reads
+        snapshot = self._snapshot
+        if snapshot is not None:
+            for name in names:
+                if name not in snapshot.cells:
+                    snapshot.cells[name] = self.cells.get(name)
+        stack = []
+        for name in names:
+            if snapshot is not None and name in self.values:
+                snapshot.values.setdefault(name, self.values[name])
+            self.dirty.add(name)
+            self.invalidation_count += 1
+            self.values.pop(name, None)
+            if reads:
+                reads.pop(name, None)
+            stack.append(name)
+        while stack:
+            current = stack.pop()
+            for dependent in self._dependents(current):
+                changes = self.range_changes.get(dependent)
+                if changes is not None:
+                    if current in new_cells:
+                        # the range gained a member, rebuild it
+                        del self.range_values[dependent]
+                        del self.range_changes[dependent]
+                    else:
+                        changes.add(current)
+                if dependent in self.values:
+                    read = reads.get(dependent) if reads else None
+                    if read is not None:
+                        if current not in read:
+                            continue  # its value came from the other If branch
+                        del reads[dependent]
+                    if snapshot is not None:
+                        snapshot.values.setdefault(dependent, self.values[dependent])
+                    del self.values[dependent]
+                    self.dirty.add(dependent)
+                    self.invalidation_count += 1
+                    stack.append(dependent)
+
+    def _update_deps(self, name: str, expr_obj: Expression) -> None:
+        dependencies = set()
+        old_deps = self.deps.get(name, set())
+        try:
             # remove old rev_deps
-            old_deps = self.deps.get(name, set())
             for dep in old_deps:
                 if name in self.rev_deps.get(dep, set()):
                     self.rev_deps[dep].remove(name)
 
-            expr_obj = Expression(expr)
+            if name not in self.deps:
+                # a new cell feeds every range already covering it. nothing reads
+                # into it yet, so these edges can't close a cycle
+                self.deps[name] = set()
+                self.order.add_node(name)
+                for range_name in self.ranges.containing(name):
+                    self.order.add_edge(name, range_name)
+
             dependencies = expr_obj.get_dependencies()
+            for dep in dependencies:
+                if not is_range(dep):
+                    continue
+                if _in_range(name, dep):
+                    raise ValueError("#ERROR Circular dependency detected")
+                if dep not in self.ranges:
+                    self.ranges.add(dep)
+                    self.order.add_node(dep)
+
             # re-write deps
             self.deps[name] = dependencies
 
-            if self._has_cycle(name, name, set()):
-                raise ValueError("#ERROR Circular dependency detected")
+            for dep in dependencies:
+                if not self.order.add_edge(dep, name):
+                    raise ValueError("#ERROR Circular dependency detected")
 
             for dep in dependencies:
                 # add name to rev_deps list (dict where if key changes value, all items in set its holding must change)
@@ -75,32 +489,106 @@ class Spreadsheet:
                     self.rev_deps[dep].add(name)
                 else:
                     self.rev_deps[dep] = {name}
+
+            for dep in old_deps - dependencies:
+                self._release_range(dep)
         except ValueError as e:
             print(f"#ERROR in cell {name}: {e}")
             self.deps[name] = set()
+            for dep in old_deps | dependencies:
+                self._release_range(dep)
             raise
 
-    def _has_cycle(self, start: str, current: str, visited: set) -> bool:
-        if current in visited:
-            return False
-        visited.add(current)
+    def _rebuild_order(self) -> None:
+        names = set(self.deps) | set(self.rev_deps) | set(self.ranges.bounds)
+        self.order.reset(topological_order(names, self._dependents))
 
-        for next_cell in self.deps.get(current, set()):
-            if next_cell == start:
-                return True  # Cycle found!
-            if self._has_cycle(start, next_cell, visited):
-                return True
-        return False
+    def _release_range(self, name: str) -> None:
+        # forget a range once no cell reads it. an active snapshot keeps its value, so
+        # restore() caches the range again when a restored formula reads it
+        if is_range(name) and not self.rev_deps.get(name):
+            snapshot = self._snapshot
+            if snapshot is not None and name in self.values:
+                snapshot.values.setdefault(name, self.values[name])
+            self.ranges.remove(name)
+            self.order.discard(name)
+            self.rev_deps.pop(name, None)
+            self.values.pop(name, None)
+            self.range_values.pop(name, None)
+            self.range_changes.pop(name, None)
+            self.dirty.discard(name)
+
+    def _dependents(self, name: str):
+        dependents = self.rev_deps.get(name, ())
+        if self.ranges and not is_range(name):
+            containing = self.ranges.containing(name)
+            if containing:
+                return [*dependents, *containing]
+        return dependents
+
+    def _predecessors(self, name: str):
+        if is_range(name):
+            return self._range_members(name, self.deps)
+        return self.deps.get(name, ())
+
+    def _range_members(self, name: str, cells=None) -> list[str]:
+        # the non-empty cells of a range, row by row
+        if cells is None:
+            cells = self.cells
+        bounds = self.ranges.bounds.get(name) or range_bounds(name)
+        first_col, first_row, last_col, last_row = bounds
+        area = (last_col - first_col + 1) * (last_row - first_row + 1)
+        if area <= len(cells):
+            # formatted directly, a big range would only churn the name cache
+            letters = [col_name(col) for col in range(first_col, last_col + 1)]
+            members = []
+            for row in range(first_row, last_row + 1):
+                for col in letters:
+                    cell = f"{col}{row}"
+                    if cell in cells:
+                        members.append(cell)
+            return members
+
+        found = []
+        for cell in cells:
+            if not is_cell_name(cell):
+                continue
+            col, row = split_name(cell)
+            if first_col <= col <= last_col and first_row <= row <= last_row:
+                found.append((row, col, cell))
+        found.sort()
+        return [cell for _, _, cell in found]
 
-    def _generate_values(self, expr_obj: Expression) -> dict:
-        dependencies = expr_obj.get_dependencies()
+    def _read(self, read: set, name: str):
+        # get_value of a lazy evaluation: a cell without a value yet aborts it
+        if name not in self.values:
+            raise _Unread(name)
+        read.add(name)
+        return self.values[name]
+
+    def _generate_values(self, name: str) -> dict:
+        # all dependencies are already cached by get_cell_value
         value_dict = {}
-        for cell in dependencies:
-            value_dict[cell] = self.get_cell_value(cell)
+        for cell in self.deps.get(name, ()):
+            value_dict[cell] = self.values[cell]
 
         return value_dict
 
 
+class _Unread(Exception):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.name = name
+
+
+def _in_range(name: str, range_name: str) -> bool:
+    if not is_cell_name(name):
+        return False
+    first_col, first_row, last_col, last_row = range_bounds(range_name)
+    col, row = split_name(name)
+    return first_col <= col <= last_col and first_row <= row <= last_row
+
+
 if __name__ == "__main__":
     sheet = Spreadsheet()
     sheet.set_cell("A1", "10")
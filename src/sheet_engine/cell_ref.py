@@ -0,0 +1,97 @@
+import re
+from functools import lru_cache
+
+_CELL_NAME = re.compile(r"([A-Z]+)(\d+)")
+
+# a cell coordinate packed into one int: column above bit 32, row below
+ROW_BITS = 32
+ROW_MASK = (1 << ROW_BITS) - 1
+
+
+def col_index(letters: str) -> int:
+    # "A" -> 0, "Z" -> 25, "AA" -> 26
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def col_name(index: int) -> str:
+    name = ""
+    while index >= 0:
+        name = chr(index % 26 + 65) + name
+        index = index // 26 - 1
+    return name
+
+
+def pack(col: int, row: int) -> int:
+    return col << ROW_BITS | row
+
+
+def unpack(key: int) -> tuple[int, int]:
+    return key >> ROW_BITS, key & ROW_MASK
+
+
+# the same names are converted over and over (deps, ranges, templates, the ui),
+# so both directions of the codec are cached
+@lru_cache(maxsize=1 << 16)
+def cell_key(name: str) -> int | None:
+    # "B3" -> pack(1, 3), None for anything that isn't a cell name
+    match = _CELL_NAME.fullmatch(name)
+    if match is None:
+        return None
+    letters, row = match.groups()
+    row = int(row)
+    if row > ROW_MASK:
+        return None
+    return pack(col_index(letters), row)
+
+
+@lru_cache(maxsize=1 << 16)
+def cell_name(key: int) -> str:
+    col, row = unpack(key)
+    return f"{col_name(col)}{row}"
+
+
+def cell_keys(names) -> list[int | None]:
+    return list(map(cell_key, names))
+
+
+def cell_names(keys) -> list[str]:
+    return list(map(cell_name, keys))
+
+
+def split_name(name: str) -> tuple[int, int]:
+    key = cell_key(name)
+    if key is None:
+        raise ValueError(f"Invalid cell name: {name}")
+    return key >> ROW_BITS, key & ROW_MASK
+
+
+def is_cell_name(name: str) -> bool:
+    return cell_key(name) is not None
+
+
+def join_name(col: int, row: int) -> str:
+    return cell_name(pack(col, row))
+
+
+def is_range(name: str) -> bool:
+    return ":" in name
+
+
+def range_name(start: str, end: str) -> str:
+    # canonical "top-left:bottom-right" name, whichever corners were written
+    first_col, first_row = split_name(start)
+    last_col, last_row = split_name(end)
+    return (
+        f"{join_name(min(first_col, last_col), min(first_row, last_row))}:"
+        f"{join_name(max(first_col, last_col), max(first_row, last_row))}"
+    )
+
+
+def range_bounds(name: str) -> tuple[int, int, int, int]:
+    start, end = name.split(":")
+    first_col, first_row = split_name(start)
+    last_col, last_row = split_name(end)
+    return first_col, first_row, last_col, last_row
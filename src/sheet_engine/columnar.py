@@ -0,0 +1,113 @@
+from array import array
+from collections.abc import MutableMapping
+
+from .cell_ref import cell_key, join_name, unpack
+
+_EMPTY, _INT, _FLOAT, _BOOL = 0, 1, 2, 3
+_EXACT_INT = 2**53  # larger ints don't survive a double
+
+
+class _Column:
+    def __init__(self):
+        self.numbers = array("d")
+        self.tags = array("B")  # _EMPTY/_INT/_FLOAT/_BOOL per row
+
+    def grow(self, row: int) -> None:
+        missing = row + 1 - len(self.tags)
+        if missing > 0:
+            self.numbers.frombytes(bytes(8 * missing))  # zero bytes are 0.0
+            self.tags.frombytes(bytes(missing))
+
+
+# drop-in for the values dict: numbers of A1 cells live in one double array per
+# column with a type tag byte, so an entry costs 9 bytes instead of a str key,
+# a boxed number and a dict slot. strings, errors, ranges and other names stay in a dict
+class ColumnarValues(MutableMapping):
+    def __init__(self):
+        self.columns = {}  # col index -> _Column
+        self.sparse = {}
+        self._count = 0  # numbers stored in columns
+
+    def __getitem__(self, name):
+        coords = _coords(name)
+        if coords is not None:
+            column = self.columns.get(coords[0])
+            row = coords[1]
+            if column is not None and row < len(column.tags):
+                tag = column.tags[row]
+                if tag == _INT:
+                    return int(column.numbers[row])
+                if tag == _FLOAT:
+                    return column.numbers[row]
+                if tag == _BOOL:
+                    return column.numbers[row] != 0.0
+        return self.sparse[name]
+
+    def __setitem__(self, name, value) -> None:
+        coords = _coords(name)
+        tag = _tag(value) if coords is not None else _EMPTY
+        if tag == _EMPTY:
+            if coords is not None:
+                self._clear(*coords)
+            self.sparse[name] = value
+            return
+
+        self.sparse.pop(name, None)
+        col, row = coords
+        column = self.columns.get(col)
+        if column is None:
+            column = self.columns[col] = _Column()
+        column.grow(row)
+        if column.tags[row] == _EMPTY:
+            self._count += 1
+        column.numbers[row] = value
+        column.tags[row] = tag
+
+    def __delitem__(self, name) -> None:
+        coords = _coords(name)
+        if coords is not None and self._clear(*coords):
+            return
+        del self.sparse[name]
+
+    def __contains__(self, name) -> bool:
+        coords = _coords(name)
+        if coords is not None:
+            column = self.columns.get(coords[0])
+            row = coords[1]
+            if column is not None and row < len(column.tags) and column.tags[row]:
+                return True
+        return name in self.sparse
+
+    def __iter__(self):
+        for col, column in self.columns.items():
+            for row, tag in enumerate(column.tags):
+                if tag:
+                    yield join_name(col, row)
+        yield from self.sparse
+
+    def __len__(self) -> int:
+        return self._count + len(self.sparse)
+
+    def _clear(self, col: int, row: int) -> bool:
+        column = self.columns.get(col)
+        if column is None or row >= len(column.tags) or not column.tags[row]:
+            return False
+        column.tags[row] = _EMPTY
+        self._count -= 1
+        return True
+
+
+def _coords(name):
+    key = cell_key(name) if type(name) is str else None
+    return None if key is None else unpack(key)
+
+
+def _tag(value) -> int:
+    kind = type(value)
+    if kind is int:
+        return _INT if -_EXACT_INT <= value <= _EXACT_INT else _EMPTY
+    if kind is float:
+        return _FLOAT
+    if kind is bool:
+        return _BOOL
+    return _EMPTY
@@ -0,0 +1,146 @@
+from weakref import WeakKeyDictionary
+from .formula import (
+    Formula,
+    LiteralInt,
+    LiteralStr,
+    CellId,
+    CellRange,
+    Power,
+    Plus,
+    Minus,
+    Multiply,
+    Divide,
+    Sum,
+    Concat,
+    Equal,
+    GreaterThen,
+    LessThen,
+    Max,
+    Min,
+    If,
+    ErrorFormula,
+)
+from .range_values import range_max, range_min, range_total
+
+# trees are shared through the parse cache, so compile each one once
+_compiled = WeakKeyDictionary()
+
+# longer sums call _total instead of nesting past the python parser's limit
+_INLINE_SUM = 32
+
+_BINARY_OPS = {
+    Plus: "+",
+    Minus: "-",
+    Multiply: "*",
+    Divide: "/",
+    Equal: "==",
+    GreaterThen: ">",
+    LessThen: "<",
+}
+
+
+def compile_formula(tree: Formula):
+    # fn(values) returning the same value as tree.evaluate(values.__getitem__)
+    fn = _compiled.get(tree)
+    if fn is None:
+        fn = _compile(tree)
+        _compiled[tree] = fn
+    return fn
+
+
+def _total(*parts):
+    # same left to right `total += x` as Sum.evaluate, so float results match exactly
+    total = 0
+    for part in parts:
+        total += part
+    return total
+
+
+def _compile(tree: Formula):
+    # generate one python expression for the whole tree
+    namespace = {
+        "_total": _total,
+        "_range_total": range_total,
+        "_range_max": range_max,
+        "_range_min": range_min,
+        "str": str,
+        "max": max,
+        "min": min,
+        "map": map,
+    }
+    try:
+        source = _source(tree, namespace)
+        return eval(f"lambda values: {source}", namespace)
+    except (RecursionError, SyntaxError, MemoryError):
+        # too deep for the python compiler, keep walking the tree
+        return lambda values: tree.evaluate(values.__getitem__)
+
+
+def _source(node: Formula, namespace: dict) -> str:
+    kind = type(node)
+
+    if kind in (LiteralInt, LiteralStr) and type(node.value) in (int, str):
+        return repr(node.value)
+
+    if kind in (CellId, CellRange):
+        return f"values[{node.name!r}]"
+
+    if kind is ErrorFormula:
+        return repr(f"#ERROR: {node.message}")
+
+    if kind in _BINARY_OPS:
+        left = _source(node.left, namespace)
+        right = _source(node.right, namespace)
+        return f"({left} {_BINARY_OPS[kind]} {right})"
+
+    if kind is Power:
+        return f"({_source(node.base, namespace)} ** {_source(node.power, namespace)})"
+
+    if kind is Sum:
+        if len(node.formula_lst) > _INLINE_SUM or _has_range(node.formula_lst):
+            return f"_total({_args(node.formula_lst, namespace, '_range_total({})')})"
+        source = "0"
+        for expr in node.formula_lst:
+            source = f"({source} + {_source(expr, namespace)})"
+        return source
+
+    if kind is Concat:
+        parts = [
+            f'"".join(map(str, {_source(expr, namespace)}))'
+            if type(expr) is CellRange
+            else f"str({_source(expr, namespace)})"
+            for expr in node.formula_lst
+        ]
+        return "(" + " + ".join(['""'] + parts) + ")"
+
+    if kind in (Max, Min):
+        func = "max" if kind is Max else "min"
+        if len(node.formula_lst) == 1 or _has_range(node.formula_lst):
+            args = _args(node.formula_lst, namespace, f"*_range_{func}({{}})")
+            return f"{func}([{args}])"
+        return f"{func}({_args(node.formula_lst, namespace)})"
+
+    if kind is If:
+        condition = _source(node.condition, namespace)
+        then_expr = _source(node.then_expr, namespace)
+        else_expr = _source(node.else_expr, namespace)
+        return f"({then_expr} if {condition} else {else_expr})"
+
+    # anything without a compiled form keeps its interpreter
+    const = f"_node{len(namespace)}"
+    namespace[const] = node
+    return f"{const}.evaluate(values.__getitem__)"
+
+
+def _args(formula_lst, namespace: dict, range_part: str = "*{}") -> str:
+    # ranges go through range_part, spread into their cell values by default, like formula._arg_values
+    return ", ".join(
+        range_part.format(_source(expr, namespace))
+        if type(expr) is CellRange
+        else _source(expr, namespace)
+        for expr in formula_lst
+    )
+
+
+def _has_range(formula_lst) -> bool:
+    return any(type(expr) is CellRange for expr in formula_lst)
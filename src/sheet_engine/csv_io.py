@@ -0,0 +1,78 @@
+import csv
+import os
+
+from .cell_ref import col_name, is_cell_name, split_name
+
+# rows handed to set_cells at once: each chunk is one invalidation, one pass over
+# the dependencies and one cycle check, and only one chunk is held in memory
+CHUNK_ROWS = 10_000
+
+
+def import_rows(sheet, rows, chunk_rows: int = CHUNK_ROWS, start: str = "A1") -> int:
+    # rows is any iterable of field sequences (a csv.reader, a generator), consumed
+    # as it goes. fields are cell texts as set_cell takes them, empty ones are
+    # skipped. returns the number of rows read
+    first_col, row = split_name(start)
+    letters = []
+    chunk = {}
+    count = 0
+    for count, fields in enumerate(rows, 1):
+        while len(letters) < len(fields):
+            letters.append(col_name(first_col + len(letters)))
+        for letter, text in zip(letters, fields):
+            if text:
+                chunk[f"{letter}{row}"] = text
+        row += 1
+        if count % chunk_rows == 0:
+            sheet.set_cells(chunk)
+            chunk = {}
+    sheet.set_cells(chunk)
+    return count
+
+
+def export_rows(sheet, start: str = "A1"):
+    # the computed values from start to the last used row and column, one list
+    # per row, each value computed (or taken from the cache) as its row is reached.
+    # trailing empty cells of a row are left out, as a csv would have them. cells
+    # with names that aren't A1 references have no place in the grid and are skipped
+    first_col, first_row = split_name(start)
+    last_col = last_row = -1
+    for name in sheet.cells:
+        if not is_cell_name(name):
+            continue
+        col, row = split_name(name)
+        last_col = max(last_col, col)
+        last_row = max(last_row, row)
+
+    letters = [col_name(col) for col in range(first_col, last_col + 1)]
+    for row in range(first_row, last_row + 1):
+        values = []
+        width = 0
+        for letter in letters:
+            name = f"{letter}{row}"
+            if name in sheet.cells:
+                values.append(sheet.get_cell_value(name))
+                width = len(values)
+            else:
+                values.append("")
+        yield values[:width]
+
+
+def import_csv(sheet, source, chunk_rows: int = CHUNK_ROWS, start: str = "A1") -> int:
+    # source is a path or an open text file
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="") as file:
+            return import_rows(sheet, csv.reader(file), chunk_rows, start)
+    return import_rows(sheet, csv.reader(source), chunk_rows, start)
+
+
+def export_csv(sheet, target, start: str = "A1") -> int:
+    # target is a path or an open text file, returns the number of rows written
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", newline="") as file:
+            return export_csv(sheet, file, start)
+    writer = csv.writer(target)
+    count = 0
+    for count, values in enumerate(export_rows(sheet, start), 1):
+        writer.writerow(values)
+    return count
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from .cell_ref import range_name
+from .range_values import range_max, range_min, range_total
 
 
 class Formula(ABC):
@@ -57,6 +59,36 @@ class CellId(Formula):
         return f"CellId({self.name})"
 
 
+class CellRange(Formula):
+    def __init__(self, start: str, end: str):
+        self.name = range_name(start, end)
+
+    def evaluate(self, get_value):
+        # list of the values of the non-empty cells in the range, row by row
+        return get_value(self.name)
+
+    def get_dependencies(self):
+        return {self.name}
+
+    def __repr__(self):
+        return f"CellRange({self.name})"
+
+
+def _arg_values(formula_lst, get_value, range_part=None):
+    # function arguments with ranges spread out into their cell values,
+    # or into range_part(values) when the function can use the range's aggregate
+    for expr in formula_lst:
+        if isinstance(expr, CellRange):
+            values = expr.evaluate(get_value)
+            yield from (values if range_part is None else range_part(values))
+        else:
+            yield expr.evaluate(get_value)
+
+
+def _range_sum(values):
+    return (range_total(values),)
+
+
 class Power(Formula):
     def __init__(self, base: Formula, power: Formula):
         self.base = base
@@ -138,8 +170,8 @@ class Sum(Formula):
 
     def evaluate(self, get_value):
         total = 0
-        for Formula in self.formula_lst:
-            total += Formula.evaluate(get_value)
+        for value in _arg_values(self.formula_lst, get_value, _range_sum):
+            total += value
         return total
 
     def get_dependencies(self):
@@ -164,8 +196,8 @@ class Concat(Formula):
 
     def evaluate(self, get_value):
         result = ""
-        for expr in self.formula_lst:
-            result += str((expr.evaluate(get_value)))
+        for value in _arg_values(self.formula_lst, get_value):
+            result += str(value)
         return result
 
     def get_dependencies(self):
@@ -233,7 +265,7 @@ class Max(Formula):
         self.formula_lst = formula_lst
 
     def evaluate(self, get_value):
-        return max(expr.evaluate(get_value) for expr in self.formula_lst)
+        return max(_arg_values(self.formula_lst, get_value, range_max))
 
     def get_dependencies(self):
         deps = set()
@@ -255,7 +287,7 @@ class Min(Formula):
         self.formula_lst = formula_lst
 
     def evaluate(self, get_value):
-        return min(expr.evaluate(get_value) for expr in self.formula_lst)
+        return min(_arg_values(self.formula_lst, get_value, range_min))
 
     def get_dependencies(self):
         deps = set()
@@ -311,6 +343,28 @@ class ErrorFormula(Formula):
         return self.message
 
 
+def conditional_dependencies(tree: Formula) -> set:
+    # the names read only inside an If branch, an evaluation taking the other branch
+    # never reads them. iterative so deep trees don't hit the recursion limit
+    strict = set()
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, If):
+            stack.append(node.condition)
+        elif isinstance(node, (CellId, CellRange)):
+            strict.add(node.name)
+        elif isinstance(node, Power):
+            stack.extend((node.base, node.power))
+        elif isinstance(node, (Sum, Concat, Max, Min)):
+            stack.extend(node.formula_lst)
+        elif isinstance(
+            node, (Plus, Minus, Multiply, Divide, Equal, GreaterThen, LessThen)
+        ):
+            stack.extend((node.left, node.right))
+    return tree.get_dependencies() - strict
+
+
 ALL_FUNCTION_NAMES = [
     ("If", If),
     ("Sum", Sum),
@@ -0,0 +1,140 @@
+from collections import Counter
+from weakref import WeakKeyDictionary
+from .formula import (
+    Formula,
+    LiteralInt,
+    LiteralStr,
+    CellId,
+    Power,
+    Plus,
+    Minus,
+    Multiply,
+    Divide,
+    Sum,
+    Concat,
+    Equal,
+    GreaterThen,
+    LessThen,
+    Max,
+    Min,
+    If,
+)
+
+# trees are shared through the parse cache, so simplify each one once
+_simplified = WeakKeyDictionary()
+
+_BINARY = (Plus, Minus, Multiply, Divide, Equal, GreaterThen, LessThen)
+_LISTS = (Concat, Max, Min)
+
+# folding 9^999999 would only move a slow evaluation to parse time
+_MAX_POWER = 64
+
+
+def simplify(tree: Formula) -> Formula:
+    # an equivalent tree with constant subtrees folded, integer literals of a Sum merged
+    # into one, If on a constant condition replaced by its branch and repeated cells of
+    # a Sum counted once (A1+A1 -> 2*A1). the tree itself is left as parsed.
+    # reordering a Sum can round float results differently in the last place
+    result = _simplified.get(tree)
+    if result is None:
+        try:
+            result = _simplify(tree)
+        except RecursionError:
+            result = tree
+        _simplified[tree] = result
+    return result
+
+
+def _simplify(node: Formula) -> Formula:
+    kind = type(node)
+
+    if kind in _BINARY:
+        left = _simplify(node.left)
+        right = _simplify(node.right)
+        if left is node.left and right is node.right:
+            return _fold(node)
+        return _fold(kind(left, right))
+
+    if kind is Power:
+        base = _simplify(node.base)
+        power = _simplify(node.power)
+        if type(power) is LiteralInt and abs(power.value) > _MAX_POWER:
+            return Power(base, power)
+        return _fold(Power(base, power))
+
+    if kind is Sum:
+        return _simplify_sum([_simplify(expr) for expr in node.formula_lst])
+
+    if kind in _LISTS:
+        return _fold(kind([_simplify(expr) for expr in node.formula_lst]))
+
+    if kind is If:
+        condition = _simplify(node.condition)
+        if _is_literal(condition) or _is_constant(condition):
+            try:
+                taken = bool(condition.evaluate(_no_cells))
+            except (ArithmeticError, TypeError, ValueError):
+                pass
+            else:
+                return _simplify(node.then_expr if taken else node.else_expr)
+        return If([condition, _simplify(node.then_expr), _simplify(node.else_expr)])
+
+    return node
+
+
+def _simplify_sum(args: list) -> Formula:
+    # Sum adds left to right onto 0, so with the integer literals merged into a
+    # leading term a string argument still raises, and a 0 term can be dropped
+    literal = 0
+    counts = Counter(expr.name for expr in args if type(expr) is CellId)
+    seen = set()
+    rest = []
+    for expr in args:
+        if type(expr) is LiteralInt and type(expr.value) is int:
+            literal += expr.value
+        elif type(expr) is CellId and counts[expr.name] > 1:
+            # the first occurrence stands for all of them
+            if expr.name not in seen:
+                seen.add(expr.name)
+                rest.append(Multiply(LiteralInt(counts[expr.name]), expr))
+        else:
+            rest.append(expr)
+    if literal or not rest:
+        rest.insert(0, LiteralInt(literal))
+    return _fold(Sum(rest))
+
+
+def _fold(node: Formula) -> Formula:
+    # a node reading no cells is computed now. results that aren't a plain int or
+    # str (floats, bools) and errors are left to evaluation
+    if not _is_constant(node):
+        return node
+    try:
+        value = node.evaluate(_no_cells)
+    except (ArithmeticError, TypeError, ValueError):
+        return node
+    if type(value) is int:
+        return LiteralInt(value)
+    if type(value) is str and not value.startswith("#ERROR"):
+        return LiteralStr(value)
+    return node
+
+
+def _is_constant(node: Formula) -> bool:
+    # every operand a literal, nested nodes have been folded already
+    kind = type(node)
+    if kind in _BINARY:
+        return _is_literal(node.left) and _is_literal(node.right)
+    if kind is Power:
+        return _is_literal(node.base) and _is_literal(node.power)
+    if kind in _LISTS or kind is Sum:
+        return all(_is_literal(expr) for expr in node.formula_lst)
+    return False
+
+
+def _is_literal(node: Formula) -> bool:
+    return type(node) in (LiteralInt, LiteralStr)
+
+
+def _no_cells(name: str):
+    raise TypeError(f"constant read {name}")
@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .Expression import Expression
+from .cell_ref import is_range
+
+# levels smaller than this aren't worth a round trip to the workers
+MIN_PARALLEL = 256
+
+
+# each worker process keeps the expressions it was sent, the pool lives as long as
+# the sheet so later recalcs don't parse again
+_expressions = {}  # name -> Expression
+
+
+def evaluate_chunk(chunk: list, compiled: bool, simplified: bool = False) -> list:
+    # runs in a worker: (name, expr text, dependency values) -> (name, value)
+    results = []
+    for name, expr, values in chunk:
+        cached = _expressions.get(name)
+        if cached is None or cached.expr != expr:
+            cached = _expressions[name] = Expression(expr, name)
+        results.append((name, cached.evaluate(values, compiled, simplified)))
+    return results
+
+
+def levels(names, predecessors, pending) -> list[list]:
+    # group names and the pending cells they read by depth: a cell only reads
+    # cells of earlier levels, so each level can be computed in any order
+    depth = {}
+    for root in names:
+        stack = [root]
+        while stack:
+            current = stack[-1]
+            if current in depth:
+                stack.pop()
+                continue
+            deps = [dep for dep in predecessors(current) if pending(dep)]
+            missing = [dep for dep in deps if dep not in depth]
+            if missing:
+                stack.extend(missing)
+                continue
+            depth[current] = max((depth[dep] + 1 for dep in deps), default=0)
+            stack.pop()
+
+    grouped = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for name, level in depth.items():
+        grouped[level].append(name)
+    return grouped
+
+
+def recalculate_levels(sheet, order: list, pool: ProcessPoolExecutor, workers: int):
+    # evaluate the dirty cells level by level, the big levels spread over the pool.
+    # ranges and the cells reading them stay local, their values are aggregates
+    def pending(name):
+        return name not in sheet.values and (name in sheet.cells or is_range(name))
+
+    for level in levels(order, sheet._predecessors, pending):
+        shipped = []
+        for name in level:
+            expr = sheet.cells.get(name)
+            if name in sheet.values:
+                continue
+            if (
+                expr is None
+                or expr.tree is None
+                or is_range(name)
+                or any(is_range(dep) for dep in sheet.deps.get(name, ()))
+            ):
+                sheet.get_cell_value(name)
+            else:
+                shipped.append(name)
+
+        if len(shipped) < MIN_PARALLEL:
+            for name in shipped:
+                sheet.get_cell_value(name)
+            continue
+
+        chunk_size = -(-len(shipped) // (workers * 4))
+        futures = []
+        for start in range(0, len(shipped), chunk_size):
+            chunk = []
+            for name in shipped[start : start + chunk_size]:
+                values = {}
+                for dep in sheet.deps.get(name, ()):
+                    values[dep] = sheet.get_cell_value(dep)
+                chunk.append((name, sheet.cells[name].expr, values))
+            futures.append(
+                pool.submit(
+                    evaluate_chunk,
+                    chunk,
+                    sheet.compile_formulas,
+                    sheet.simplify_formulas,
+                )
+            )
+        for future in futures:
+            for name, value in future.result():
+                sheet.values[name] = value
+                sheet.dirty.discard(name)
+                sheet.evaluation_count += 1
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from .parser import parse_expr
+from .formula import Formula
+from .cell_ref import split_name
+from .template import FormulaTemplate, relative_key
+
+
+# bounded LRU of parsed trees keyed by formula text. trees are never mutated after
+# parsing, so every cell with the same text can share one
+class ParseCache:
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+
+    def parse(self, expr: str) -> Formula:
+        tree = self._get(expr)
+        if tree is not None:
+            self.hits += 1
+            return tree
+
+        self.misses += 1
+        tree = parse_expr(expr)
+        self._put(expr, tree)
+        return tree
+
+    def template(self, expr: str, name: str) -> tuple[FormulaTemplate, tuple[int, int]]:
+        # shared template for a formula held by cell `name`, plus the cell's offset from its origin
+        col, row = split_name(name)
+        template = self._get(("text", expr))
+        if template is not None:
+            # same text, the tree already names our cells
+            self.hits += 1
+            return template, (0, 0)
+
+        key = ("relative", relative_key(expr, name))
+        template = self._get(key)
+        if template is not None:
+            self.hits += 1
+            origin_col, origin_row = template.origin
+            return template, (col - origin_col, row - origin_row)
+
+        self.misses += 1
+        template = FormulaTemplate(parse_expr(expr), (col, row))
+        self._put(("text", expr), template)
+        self._put(key, template)
+        return template, (0, 0)
+
+    def _get(self, key):
+        value = self._trees.get(key)
+        if value is not None:
+            self._trees.move_to_end(key)
+        return value
+
+    def _put(self, key, value) -> None:
+        if self.maxsize > 0:
+            self._trees[key] = value
+            if len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._trees) > max(maxsize, 0):
+            self._trees.popitem(last=False)
+
+    def clear(self) -> None:
+        self._trees.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def __repr__(self):
+        return f"ParseCache(hits={self.hits}, misses={self.misses}, size={len(self)}/{self.maxsize})"
+
+
+parse_cache = ParseCache()
@@ -4,6 +4,7 @@ from .formula import (
     Formula,
     LiteralInt,
     CellId,
+    CellRange,
     Minus,
     Multiply,
     Divide,
@@ -17,6 +18,18 @@ from .formula import (
     ALL_FUNCTION_NAMES,
 )
 
+_FUNCTIONS = dict(ALL_FUNCTION_NAMES)
+
+_BINARY = {
+    "-": Minus,
+    "*": Multiply,
+    "/": Divide,
+    "^": Power,
+    "=": Equal,
+    ">": GreaterThen,
+    "<": LessThen,
+}
+
 
 def parse_expr(expr: str) -> Formula:
     try:
@@ -30,69 +43,119 @@ def parse_expr(expr: str) -> Formula:
 
 def parse_tokens(tokens: list[Token]) -> Formula:
     try:
-        output = []
-        ops = []
-        i = 0
+        parser = _Parser(tokens)
+        if not tokens:
+            raise ValueError("Empty expression")
+        tree = parser.expression()
+        if parser.pos < len(tokens):
+            token = tokens[parser.pos]
+            if token.type == TokenType.PAREN_CLOSE:
+                raise ValueError("Mismatched parentheses")
+            raise ValueError(f"Unexpected token: {token}")
+        return tree
+
+    except RecursionError:
+        print("[parse_tokens] Error: Formula is nested too deeply")
+        return LiteralInt(0)
+    except ValueError as e:
+        print(f"[parse_tokens] Error: {e}")
+        return LiteralInt(0)
 
-        while i < len(tokens):
-            token = tokens[i]
 
-            match (token.type):
+# one pass over a cursor into the token list, no slicing. binary operators are
+# folded with a small operator stack (equal precedence groups to the left), so
+# only calls and parentheses recurse
+class _Parser:
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def expression(self) -> Formula:
+        tokens = self.tokens
+        operands = []
+        ops = []
+        while True:
+            if self.pos >= len(tokens):
+                raise ValueError("Empty expression")
+            token = tokens[self.pos]
+            self.pos += 1
+
+            match token.type:
                 case TokenType.INT:
-                    output.append(LiteralInt(int(token.value)))
-                    i += 1
+                    operands.append(LiteralInt(int(token.value)))
                 case TokenType.STR:
-                    output.append(LiteralStr(token.value))
-                    i += 1
+                    operands.append(LiteralStr(token.value))
                 case TokenType.CELL:
-                    output.append(CellId(token.value))
-                    i += 1
+                    operands.append(CellId(token.value))
+                case TokenType.RANGE:
+                    start, end = token.value.split(":")
+                    operands.append(CellRange(start, end))
                 case TokenType.FUNC:
-                    func_expr, i = _parse_func_call(tokens, i, token.value)
-                    output.append(func_expr)
-                case TokenType.OP:
-                    while (
-                        ops
-                        and ops[-1].type != "paren"
-                        and _precedence(ops[-1].value) >= _precedence(token.value)
-                    ):
-                        _reduce_stack(output, ops)
-                    ops.append(token)
-                    i += 1
+                    operands.append(self.call(token.value))
                 case TokenType.PAREN_OPEN:
-                    ops.append(token)
-                    i += 1
-                case TokenType.PAREN_CLOSE:
-                    while ops and (ops[-1].type != TokenType.PAREN_OPEN):
-                        _reduce_stack(output, ops)
-                    if not ops or (
-                        ops[-1].type != TokenType.PAREN_OPEN and ops[-1].value == "("
+                    operands.append(self.expression())
+                    if (
+                        self.pos >= len(tokens)
+                        or tokens[self.pos].type != TokenType.PAREN_CLOSE
                     ):
                         raise ValueError("Mismatched parentheses")
-                    ops.pop()
-                    i += 1
-                case TokenType.COMMA:
-                    i += 1  # handled in _parse_func_call
-
+                    self.pos += 1
                 case _:
                     raise ValueError(f"Unexpected token: {token}")
 
-        while ops:
-            _reduce_stack(output, ops)
-
-        if not output:
-            raise ValueError("Empty expression")
-
-        return output[0]
+            if self.pos >= len(tokens) or tokens[self.pos].type != TokenType.OP:
+                break
+            op = tokens[self.pos].value
+            self.pos += 1
+            while ops and _precedence(ops[-1]) >= _precedence(op):
+                _reduce_stack(operands, ops)
+            ops.append(op)
 
-    except ValueError as e:
-        print(f"[parse_tokens] Error: {e}")
-        return LiteralInt(0)
+        while ops:
+            _reduce_stack(operands, ops)
+        return operands[0]
+
+    def call(self, func_name: str) -> Formula:
+        tokens = self.tokens
+        try:
+            if self.pos >= len(tokens) or tokens[self.pos].type != TokenType.PAREN_OPEN:
+                raise ValueError(f"Expected '(' after function name '{func_name}'")
+            self.pos += 1
+
+            args = []
+            while self.pos < len(tokens):
+                if tokens[self.pos].type == TokenType.PAREN_CLOSE:
+                    self.pos += 1
+                    if func_name not in _FUNCTIONS:
+                        raise ValueError(f"Unknown function '{func_name}'")
+                    return _FUNCTIONS[func_name](args)
+                # a broken argument becomes 0, the call goes on from the next ',' or ')'.
+                # parsed inline rather than in a method, one frame less per nesting level
+                start = self.pos
+                try:
+                    arg = self.expression()
+                    if self.pos < len(tokens) and tokens[self.pos].type not in (
+                        TokenType.COMMA,
+                        TokenType.PAREN_CLOSE,
+                    ):
+                        raise ValueError(f"Unexpected token: {tokens[self.pos]}")
+                except ValueError as e:
+                    print(f"[parse_tokens] Error: {e}")
+                    arg = LiteralInt(0)
+                    self.pos = _find_argument_end(tokens, start)
+                args.append(arg)
+                if self.pos < len(tokens) and tokens[self.pos].type == TokenType.COMMA:
+                    self.pos += 1
+            raise ValueError("Expected ')' to close function call")
+        except ValueError as e:
+            print(f"[parse_func_call] Error: {e}")
+            self.pos = len(tokens)  # fallback formula, nothing left to parse
+            return LiteralInt(0)
 
 
 def _reduce_stack(output, ops):
     # postfix to Formula
-    op = ops.pop().value
+    op = ops.pop()
     right = output.pop()
     left = output.pop()
     output.append(_to_expr(op, left, right))
@@ -104,28 +167,15 @@ def _precedence(op):
 
 def _to_expr(op, left, right):
     if op == "+":
-        parts = []
-
-        # extend Sum() formula if possible
-        def collect(expr):
-            if isinstance(expr, Sum):
-                parts.extend(expr.formula_lst)
-            else:
-                parts.append(expr)
-
-        collect(left)
-        collect(right)
-        return Sum(parts)
-
-    return {
-        "-": Minus,
-        "*": Multiply,
-        "/": Divide,
-        "^": Power,
-        "=": Equal,
-        ">": GreaterThen,
-        "<": LessThen,
-    }[op](left, right)
+        # extend Sum() formula if possible. the trees are new, so the left
+        # Sum grows in place instead of being copied on every +
+        parts = right.formula_lst if isinstance(right, Sum) else [right]
+        if isinstance(left, Sum):
+            left.formula_lst.extend(parts)
+            return left
+        return Sum([left, *parts])
+
+    return _BINARY[op](left, right)
 
 
 # finds index where arg ends
@@ -144,47 +194,3 @@ def _find_argument_end(tokens, start):
             return i
         i += 1
     return i
-
-
-def _parse_func_call(tokens, i, func_name):
-    try:
-        if i + 1 >= len(tokens) or tokens[i + 1].value != "(":
-            raise ValueError(f"Expected '(' after function name '{func_name}'")
-
-        i += 2  # skip function name and '('
-        args = []
-        expecting_arg = True
-        done = False
-
-        while i < len(tokens) and not done:
-            token = tokens[i]
-
-            if token.type == TokenType.PAREN_CLOSE:
-                done = True
-                i += 1
-            elif expecting_arg:
-                end = _find_argument_end(tokens, i)
-                sub_expr = parse_tokens(tokens[i:end])
-                args.append(sub_expr)
-                i = end
-                expecting_arg = False
-            else:
-                if token.type == TokenType.COMMA:
-                    i += 1
-                    expecting_arg = True
-                else:
-                    raise ValueError(
-                        f"Expected ',' or ')' after argument, got '{token}'"
-                    )
-
-        if not done:
-            raise ValueError("Expected ')' to close function call")
-
-        for name, cls in ALL_FUNCTION_NAMES:
-            if func_name == name:
-                return cls(args), i
-
-        raise ValueError(f"Unknown function '{func_name}'")
-    except ValueError as e:
-        print(f"[parse_func_call] Error: {e}")
-        return LiteralInt(0), len(tokens)  # fallback formula and safe index
@@ -0,0 +1,80 @@
+from .cell_ref import is_cell_name, split_name, range_bounds
+
+
+# finds the ranges (A1:B100 style) that contain a cell without expanding them.
+# each range is stored once per column it covers: short ranges in row blocks of the
+# smallest size they fit in, long ones in a per-column list that is scanned, so a
+# lookup only looks at ranges that can actually overlap the row
+class RangeIndex:
+    # block sizes in rows, so many short ranges don't end up in one bucket
+    BLOCKS = (1, 16, 256, 4096)
+    MAX_BLOCKS = 16  # ranges covering more blocks than this go to the long list
+
+    def __init__(self):
+        self.bounds = {}  # name -> (first_col, first_row, last_col, last_row)
+        self._blocks = {}  # (col, block size, block) -> set of names
+        self._long = {}  # col -> set of names
+
+    def add(self, name: str) -> None:
+        if name in self.bounds:
+            return
+        first_col, first_row, last_col, last_row = range_bounds(name)
+        self.bounds[name] = (first_col, first_row, last_col, last_row)
+        for col, block in self._slots(first_col, first_row, last_col, last_row):
+            if block is None:
+                self._long.setdefault(col, set()).add(name)
+            else:
+                self._blocks.setdefault((col, *block), set()).add(name)
+
+    def remove(self, name: str) -> None:
+        bounds = self.bounds.pop(name, None)
+        if bounds is None:
+            return
+        for col, block in self._slots(*bounds):
+            bucket = (
+                self._long.get(col)
+                if block is None
+                else self._blocks.get((col, *block))
+            )
+            bucket.discard(name)
+            if not bucket:
+                if block is None:
+                    del self._long[col]
+                else:
+                    del self._blocks[(col, *block)]
+
+    def containing(self, cell: str) -> list[str]:
+        if not self.bounds or not is_cell_name(cell):
+            return []
+        col, row = split_name(cell)
+        found = []
+        buckets = [self._blocks.get((col, size, row // size)) for size in self.BLOCKS]
+        buckets.append(self._long.get(col))
+        for bucket in buckets:
+            for name in bucket or ():
+                _, first_row, _, last_row = self.bounds[name]
+                if first_row <= row <= last_row:
+                    found.append(name)
+        return found
+
+    def _slots(self, first_col, first_row, last_col, last_row):
+        # (col, (block size, block)) for every bucket holding the range, block None for the long list
+        for size in self.BLOCKS:
+            first_block = first_row // size
+            last_block = last_row // size
+            if last_block - first_block < self.MAX_BLOCKS:
+                break
+        else:
+            size = None
+        for col in range(first_col, last_col + 1):
+            if size is None:
+                yield col, None
+            else:
+                for block in range(first_block, last_block + 1):
+                    yield col, (size, block)
+
+    def __contains__(self, name) -> bool:
+        return name in self.bounds
+
+    def __len__(self) -> int:
+        return len(self.bounds)
@@ -0,0 +1,107 @@
+# the value of a range node: its cells' values plus a running total and
+# segment trees for max/min, so one changed cell costs O(1) for Sum and
+# O(log n) for Max/Min instead of re-reading the whole range
+class RangeValues:
+    def __init__(self, members: list, values: list):
+        self.members = members
+        self.position = {name: i for i, name in enumerate(members)}
+        self.values = values
+        self._total = None
+        self._max_tree = None
+        self._min_tree = None
+
+    def update(self, name, value) -> None:
+        i = self.position[name]
+        old = self.values[i]
+        self.values[i] = value
+        if self._total is not None:
+            # only exact deltas, floats would drift with every update
+            if type(old) is int and type(value) is int:
+                self._total += value - old
+            else:
+                self._total = None
+        for tree, pick in ((self._max_tree, max), (self._min_tree, min)):
+            if tree is not None and not _tree_update(
+                tree, len(self.values), i, value, pick
+            ):
+                self._max_tree = self._min_tree = None
+                break
+
+    def total(self):
+        if self._total is None:
+            total = 0
+            for value in self.values:
+                total += value
+            self._total = total
+        return self._total
+
+    def maximum(self):
+        if self._max_tree is None:
+            self._max_tree = _tree_build(self.values, max)
+        return self._max_tree[1]
+
+    def minimum(self):
+        if self._min_tree is None:
+            self._min_tree = _tree_build(self.values, min)
+        return self._min_tree[1]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"RangeValues({self.values})"
+
+
+def range_total(values):
+    if isinstance(values, RangeValues):
+        return values.total()
+    total = 0
+    for value in values:
+        total += value
+    return total
+
+
+def range_max(values) -> tuple:
+    # () for an empty range, so max() over the arguments skips it
+    if not len(values):
+        return ()
+    if isinstance(values, RangeValues):
+        return (values.maximum(),)
+    return (max(values),)
+
+
+def range_min(values) -> tuple:
+    if not len(values):
+        return ()
+    if isinstance(values, RangeValues):
+        return (values.minimum(),)
+    return (min(values),)
+
+
+def _tree_build(values: list, pick) -> list:
+    # bottom-up segment tree, leaves at [n, 2n), root at 1
+    n = len(values)
+    if n == 0:
+        raise ValueError(f"{pick.__name__}() arg is an empty sequence")
+    tree = [None] * n + list(values)
+    for i in range(n - 1, 0, -1):
+        tree[i] = pick(tree[2 * i], tree[2 * i + 1])
+    return tree
+
+
+def _tree_update(tree: list, n: int, i: int, value, pick) -> bool:
+    i += n
+    tree[i] = value
+    try:
+        while i > 1:
+            i //= 2
+            tree[i] = pick(tree[2 * i], tree[2 * i + 1])
+    except TypeError:
+        return False  # not comparable any more, rebuild (and raise) on the next read
+    return True
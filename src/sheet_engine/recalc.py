@@ -0,0 +1,78 @@
+from collections import deque
+
+
+def topological_order(names: set, successors) -> list:
+    # Kahn's algorithm restricted to the given cells, dependencies come first
+    in_degree = dict.fromkeys(names, 0)
+    edges = {name: successors(name) for name in in_degree}  # each looked up once
+    for name in names:
+        for dependent in edges[name]:
+            if dependent in in_degree:
+                in_degree[dependent] += 1
+
+    ready = deque(name for name, degree in in_degree.items() if degree == 0)
+    order = []
+    while ready:
+        current = ready.popleft()
+        order.append(current)
+        for dependent in edges[current]:
+            if dependent in in_degree:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+    if len(order) != len(in_degree):
+        raise ValueError("#ERROR Circular dependency detected")
+    return order
+
+
+def find_cycles(names, successors) -> list[list]:
+    # Tarjan's strongly connected components over everything reachable from names,
+    # iterative so big sheets can't hit the recursion limit. returns the components
+    # that contain a cycle: more than one cell, or one cell reading itself
+    index = {}
+    low = {}
+    edges = {}
+    on_stack = set()
+    stack = []
+    cycles = []
+    counter = 0
+
+    for root in names:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        edges[root] = successors(root)
+        work = [(root, iter(edges[root]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    edges[child] = successors(child)
+                    work.append((child, iter(edges[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in edges[node]:
+                        cycles.append(component)
+    return cycles
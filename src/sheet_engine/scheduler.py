@@ -0,0 +1,57 @@
+from .cell_ref import is_range
+
+
+# values are already computed on demand: an edit only invalidates, and the first
+# read computes. the scheduler computes the dirty cells ahead of those reads, a
+# few at a time, the visible ones (and everything they read) first, so the
+# caller can spread the work of one edit to a huge graph over many frames
+class RecalcScheduler:
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.visible = set()
+        # get_cell_value's work stack, kept between steps. the visible cells are
+        # pushed last so they come first
+        self._stack = []
+
+    def set_visible(self, names) -> None:
+        self.visible = set(names)
+        self._stack = []
+
+    def reset(self) -> None:
+        # call after edits, the next step starts again from the new dirty cells
+        self._stack = []
+
+    @property
+    def done(self) -> bool:
+        return not self._stack and not any(map(self._pending, self.sheet.dirty))
+
+    def step(self, budget: int = 256) -> list[str]:
+        # compute up to budget cells, returns the cells (not ranges) given a value
+        sheet = self.sheet
+        stack = self._stack
+        if not stack:
+            stack.extend(sheet.dirty)
+            stack.extend(self.visible)
+        computed = []
+        while stack and budget > 0:
+            current = stack[-1]
+            if not self._pending(current):
+                stack.pop()
+                continue
+            pending = [
+                dep for dep in sheet._predecessors(current) if self._pending(dep)
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            # everything it reads is computed, this is one evaluation
+            sheet.get_cell_value(current)
+            stack.pop()
+            budget -= 1
+            if not is_range(current):
+                computed.append(current)
+        return computed
+
+    def _pending(self, name: str) -> bool:
+        sheet = self.sheet
+        return name not in sheet.values and (name in sheet.cells or is_range(name))
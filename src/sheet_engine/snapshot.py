@@ -0,0 +1,11 @@
+# the state a sheet had before the edits made since Spreadsheet.snapshot(): the
+# first expression and cached value of every cell the edits touched, recorded as
+# they are invalidated. everything else is still shared with the live sheet, so
+# taking one is O(1) and restoring it O(changed cells)
+class Snapshot:
+    def __init__(self):
+        self.cells = {}  # name -> Expression before the edits, None if it was empty
+        self.values = {}  # name -> value cached before the edits
+
+    def __repr__(self):
+        return f"Snapshot(cells={len(self.cells)}, values={len(self.values)})"
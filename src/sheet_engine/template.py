@@ -0,0 +1,45 @@
+import re
+from .cell_ref import col_index, split_name, join_name
+from .formula import Formula, conditional_dependencies
+
+
+# a formula shape shared by every cell that holds it at the same relative position,
+# e.g. =A1+B1 in C1 and =A2+B2 in C2. the tree is parsed once for the first cell
+# (the origin) and other cells only keep their (col, row) offset from it
+class FormulaTemplate:
+    def __init__(self, tree: Formula, origin: tuple[int, int]):
+        self.tree = tree
+        self.origin = origin
+        self.names = sorted(tree.get_dependencies())
+        self.conditional = conditional_dependencies(tree)  # names only If branches read
+        # one (col, row) corner per cell reference, two per range
+        self.coords = [
+            tuple(split_name(corner) for corner in dep.split(":")) for dep in self.names
+        ]
+
+    def shifted_names(self, offset: tuple[int, int]) -> list[str]:
+        dcol, drow = offset
+        return [
+            ":".join(join_name(col + dcol, row + drow) for col, row in corners)
+            for corners in self.coords
+        ]
+
+    def __repr__(self):
+        return f"FormulaTemplate({repr(self.tree)}, origin={join_name(*self.origin)})"
+
+
+# string literals are matched first so cell-like text inside them is left alone
+_REFERENCE = re.compile(r"'[^']*'|\"[^\"]*\"|([A-Z]+)(\d+)")
+
+
+def relative_key(expr: str, name: str) -> str:
+    # formula text with every cell reference rewritten relative to the cell holding it.
+    # one regex pass instead of a full tokenize, texts with equal keys tokenize alike
+    col, row = split_name(name)
+
+    def relative(match):
+        if match.group(1) is None:
+            return match.group()
+        return f"R[{int(match.group(2)) - row}]C[{col_index(match.group(1)) - col}]"
+
+    return _REFERENCE.sub(relative, expr)
@@ -10,10 +10,11 @@ class TokenType(Enum):
     PAREN_OPEN = auto()
     PAREN_CLOSE = auto()
     CELL = auto()
+    RANGE = auto()
     STR = auto()
 
 
 @dataclass
 class Token:
-    type: TokenType  # int, func, op, str, paren_open, paren_close, comma, str, cell
+    type: TokenType  # int, func, op, str, paren_open, paren_close, comma, str, cell, range
     value: str
@@ -4,11 +4,28 @@ from .formula import (
     ALL_FUNCTION_NAMES,
 )
 
+# matched in place with pos=, never on a slice of the formula
+_CELL = re.compile(r"[A-Z]+\d+(:[A-Z]+\d+)?")
+_INT = re.compile(r"\d+")
+
+# function names by first letter, in ALL_FUNCTION_NAMES order
+_FUNCTIONS = {}
+for _name, _ in ALL_FUNCTION_NAMES:
+    _FUNCTIONS.setdefault(_name[0], []).append(_name)
+
+_SINGLE = {
+    **dict.fromkeys("+-*/^=><", TokenType.OP),
+    "(": TokenType.PAREN_OPEN,
+    ")": TokenType.PAREN_CLOSE,
+    ",": TokenType.COMMA,
+}
+
 
 def tokenize(expr: str) -> list[Token]:
     tokens = []
     i = 0
-    while i < len(expr):
+    n = len(expr)
+    while i < n:
         ch = expr[i]
 
         # Skip whitespace
@@ -17,64 +34,49 @@ def tokenize(expr: str) -> list[Token]:
             continue
 
         # function names
-        matched = False
-        for name in ALL_FUNCTION_NAMES:
-            if expr.startswith(name[0], i):
-                tokens.append(Token(TokenType.FUNC, name[0]))
-                i += len(name[0])
-                matched = True
-                break
+        if ch in _FUNCTIONS:
+            name = _function_at(expr, i, _FUNCTIONS[ch])
+            if name is not None:
+                tokens.append(Token(TokenType.FUNC, name))
+                i += len(name)
+                continue
 
-        if matched:
-            continue
+        token_type = _SINGLE.get(ch)
+        if token_type is not None:
+            tokens.append(Token(token_type, ch))
+            i += 1
 
         # Cell
-        elif re.match(r"[A-Z]", ch):
-            match = re.match(r"[A-Z]+\d+", expr[i:])
+        elif "A" <= ch <= "Z":
+            match = _CELL.match(expr, i)
             if match:
-                tokens.append(Token(TokenType.CELL, match.group()))
-                i += len(match.group())
+                token_type = TokenType.RANGE if match.group(1) else TokenType.CELL
+                tokens.append(Token(token_type, match.group()))
+                i = match.end()
             else:
                 raise ValueError(f"Invalid cell reference at position {i}")
 
         # Integer
-        elif ch.isdigit():
-            match = re.match(r"\d+", expr[i:])
+        elif ch.isdigit() and (match := _INT.match(expr, i)):
             tokens.append(Token(TokenType.INT, match.group()))
-            i += len(match.group())
-
-        # Op
-        elif ch in "+-*/^=><":
-            tokens.append(Token(TokenType.OP, ch))
-            i += 1
-
-        # Paren
-        elif ch in "(":
-            tokens.append(Token(TokenType.PAREN_OPEN, ch))
-            i += 1
-
-        elif ch in ")":
-            tokens.append(Token(TokenType.PAREN_CLOSE, ch))
-            i += 1
-
-        # Comma
-        elif ch == ",":
-            tokens.append(Token(TokenType.COMMA, ch))
-            i += 1
+            i = match.end()
 
         # String
         elif ch in ('"', "'"):
-            quote = ch
-            i += 1
-            start = i
-            while i < len(expr) and expr[i] != quote:
-                i += 1
-            if i >= len(expr):
+            end = expr.find(ch, i + 1)
+            if end == -1:
                 raise ValueError("Unterminated string literal")
-            tokens.append(Token(TokenType.STR, expr[start:i]))
-            i += 1
+            tokens.append(Token(TokenType.STR, expr[i + 1 : end]))
+            i = end + 1
 
         else:
             raise ValueError(f"Unexpected character '{ch}' at position {i}")
 
     return tokens
+
+
+def _function_at(expr: str, i: int, names: list[str]) -> str | None:
+    for name in names:
+        if expr.startswith(name, i):
+            return name
+    return None
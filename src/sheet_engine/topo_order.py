@@ -0,0 +1,86 @@
+# dynamic topological order (Pearce-Kelly): every dependency keeps a lower index than the
+# cells reading it. a new edge that breaks this only searches and reorders the cells whose
+# index lies between its two ends, instead of a DFS over the whole upstream graph
+class TopologicalOrder:
+    def __init__(self, successors, predecessors):
+        self.index = {}
+        self._successors = successors
+        self._predecessors = predecessors
+        self._low = 0
+        self._high = 0
+
+    def add_edge(self, source, target) -> bool:
+        # source must be computed before target, returns False if that closes a cycle
+        if source == target:
+            return False
+        # unseen cells can go anywhere, put them where they need no reordering
+        self.add_source(source)
+        if target not in self.index:
+            self._high += 1
+            self.index[target] = self._high
+
+        lower = self.index[target]
+        upper = self.index[source]
+        if upper < lower:
+            return True
+
+        forward = self._search_forward(target, upper)
+        if forward is None:
+            return False
+        backward = self._search_backward(source, lower)
+        self._reorder(backward, forward)
+        return True
+
+    def add_node(self, name) -> None:
+        # a node whose predecessors already exist goes after all of them
+        if name not in self.index:
+            self._high += 1
+            self.index[name] = self._high
+
+    def add_source(self, name) -> None:
+        # a node nothing leads into yet goes before all others
+        if name not in self.index:
+            self._low -= 1
+            self.index[name] = self._low
+
+    def reset(self, order) -> None:
+        # replace the whole order, e.g. with a fresh sort after a bulk load
+        self.index = {name: i for i, name in enumerate(order)}
+        self._low = 0
+        self._high = len(self.index)
+
+    def discard(self, name) -> None:
+        self.index.pop(name, None)
+
+    def _search_forward(self, start, upper):
+        visited = {start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for nxt in self._successors(current):
+                position = self.index[nxt]
+                if position == upper:
+                    return None  # reached the source, cycle
+                if position < upper and nxt not in visited:
+                    visited.add(nxt)
+                    stack.append(nxt)
+        return visited
+
+    def _search_backward(self, start, lower):
+        visited = {start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for prev in self._predecessors(current):
+                if self.index[prev] > lower and prev not in visited:
+                    visited.add(prev)
+                    stack.append(prev)
+        return visited
+
+    def _reorder(self, backward, forward) -> None:
+        # reuse the freed indices: upstream cells first, then downstream ones
+        by_index = self.index.__getitem__
+        cells = sorted(backward, key=by_index) + sorted(forward, key=by_index)
+        positions = sorted(self.index[cell] for cell in cells)
+        for cell, position in zip(cells, positions):
+            self.index[cell] = position
@@ -0,0 +1,202 @@
+from .formula import (
+    CellId,
+    Divide,
+    Equal,
+    GreaterThen,
+    If,
+    LessThen,
+    LiteralInt,
+    Max,
+    Min,
+    Minus,
+    Multiply,
+    Plus,
+    Power,
+    Sum,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional, without it every cell is evaluated on its own
+    np = None
+
+# blocks smaller than this are cheaper cell by cell
+MIN_BLOCK = 64
+
+# int64 results must stay exact, and int/int divisions must round like python's
+_INT_LIMIT = 2**53
+
+
+class _Scalar(Exception):
+    # the block can't be computed as arrays with the same result, evaluate per cell
+    pass
+
+
+def evaluate_block(template, columns: dict) -> list:
+    # one template over many cells: columns maps each template dependency name to
+    # the values of that cell for every cell in the block, same order
+    arrays = {}
+    for name, values in columns.items():
+        kinds = set(map(type, values))
+        if kinds == {int} and _small(values):
+            arrays[name] = np.array(values, dtype=np.int64)
+        elif kinds == {float}:
+            arrays[name] = np.array(values, dtype=np.float64)
+        elif kinds <= {int, float, bool}:
+            # mixed numbers (or ints too big for int64) stay python objects,
+            # numpy then applies python's own operators to them one by one
+            arrays[name] = np.array(values, dtype=object)
+        else:
+            raise _Scalar()  # strings and errors
+
+    try:
+        with np.errstate(all="ignore"):
+            result = _eval(template.tree, arrays)
+    except (ArithmeticError, TypeError):
+        raise _Scalar()  # from python ops on object arrays, let the cells raise it
+    if np.ndim(result) == 0:
+        raise _Scalar()
+    if result.dtype.kind == "f" and not np.isfinite(result).all():
+        raise _Scalar()  # python raises or differs on overflow, leave it to the cells
+    return result.tolist()
+
+
+def _small(values) -> bool:
+    return max(values) < _INT_LIMIT and min(values) > -_INT_LIMIT
+
+
+def _eval(node, arrays):
+    kind = type(node)
+
+    if kind is CellId:
+        return arrays[node.name]
+    if kind is LiteralInt and type(node.value) is int and abs(node.value) < _INT_LIMIT:
+        return np.int64(node.value)
+
+    if kind in (Plus, Minus, Multiply):
+        left = _number(_eval(node.left, arrays))
+        right = _number(_eval(node.right, arrays))
+        op = {Plus: np.add, Minus: np.subtract, Multiply: np.multiply}[kind]
+        return _checked(op(left, right), op, left, right)
+
+    if kind is Sum:
+        total = np.int64(0)
+        for expr in node.formula_lst:
+            value = _number(_eval(expr, arrays))
+            total = _checked(np.add(total, value), np.add, total, value)
+        return total
+
+    if kind is Divide:
+        left = _number(_eval(node.left, arrays))
+        right = _number(_eval(node.right, arrays))
+        if np.any(right == 0):
+            raise _Scalar()  # ZeroDivisionError, per cell
+        return np.true_divide(left, right)
+
+    if kind is Power:
+        base = _number(_eval(node.base, arrays))
+        power = _number(_eval(node.power, arrays))
+        if _is_int(base) and _is_int(power) and np.any(power < 0):
+            raise _Scalar()  # int ** negative int is a float in python
+        if np.any(base < 0) and not _is_int(power):
+            raise _Scalar()  # complex in python
+        return _checked(np.power(base, power), np.power, base, power)
+
+    if kind in (Equal, GreaterThen, LessThen):
+        op = {Equal: np.equal, GreaterThen: np.greater, LessThen: np.less}[kind]
+        return op(_eval(node.left, arrays), _eval(node.right, arrays))
+
+    if kind in (Max, Min):
+        values = [_eval(expr, arrays) for expr in node.formula_lst]
+        kinds = {_kind(value) for value in values}
+        if len(kinds) != 1 or "O" in kinds:
+            raise _Scalar()  # max(1, 1.0) keeps the int, and nan ordering differs
+        op = np.maximum if kind is Max else np.minimum
+        result = values[0]
+        for value in values[1:]:
+            result = op(result, value)
+        return result
+
+    if kind is If:
+        condition = _eval(node.condition, arrays)
+        then_value = _eval(node.then_expr, arrays)
+        else_value = _eval(node.else_expr, arrays)
+        if _kind(then_value) != _kind(else_value):
+            # np.where would convert one branch to the other's type, as objects every
+            # cell keeps the python int or float its branch gave (and later ops on
+            # them are python's own)
+            then_value = np.asarray(then_value).astype(object)
+            else_value = np.asarray(else_value).astype(object)
+        return np.where(condition != 0, then_value, else_value)
+
+    raise _Scalar()  # strings, ranges, concat, errors
+
+
+def _kind(value) -> str:
+    return np.asarray(value).dtype.kind
+
+
+def _is_int(value) -> bool:
+    return np.issubdtype(np.asarray(value).dtype, np.integer)
+
+
+def _number(value):
+    # comparisons give bools, python does arithmetic on them as ints (True + True is 2)
+    if np.asarray(value).dtype == np.bool_:
+        return np.asarray(value, dtype=np.int64)
+    return value
+
+
+def _checked(result, op, left, right):
+    # int64 wraps around where python ints grow, redo it in floats to see if it could have
+    if _is_int(result):
+        bound = op(
+            np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64)
+        )
+        if not (np.abs(bound) < _INT_LIMIT).all():
+            raise _Scalar()
+    return result
+
+
+def recalculate_blocks(sheet, order: list) -> None:
+    # evaluate the dirty cells sharing a template as arrays, blocks taken in the
+    # topological order of their first cell so the cells they read are mostly
+    # computed already (the rest are computed on the way). whatever can't be done
+    # this way is left for the normal per-cell pass
+    if np is None:
+        return
+
+    blocks = {}
+    for name, expr in zip(order, map(sheet.cells.get, order)):
+        if expr is not None and expr.template is not None:
+            blocks.setdefault(expr.template, []).append(name)
+
+    for template, names in blocks.items():
+        if len(names) < MIN_BLOCK or any(":" in dep for dep in template.names):
+            continue
+        columns = _gather(sheet, template, names)
+        if columns is None:
+            continue
+        try:
+            results = evaluate_block(template, columns)
+        except _Scalar:
+            continue
+        sheet.values.update(zip(names, results))
+        sheet.dirty.difference_update(names)
+        sheet.evaluation_count += len(names)
+
+
+def _gather(sheet, template, names) -> dict | None:
+    # the values every cell of the block reads, None if the block reads itself
+    # (a running total down a column) and has to go cell by cell
+    values = sheet.values
+    shifted = [sheet.cells[name]._shifted_names() for name in names]
+    for name in set().union(*shifted).difference(values.keys()):
+        expr = sheet.cells.get(name)
+        if expr is not None and expr.template is template:
+            return None
+        sheet.get_cell_value(name)
+    return {
+        dep: [values[dep_names[i]] for dep_names in shifted]
+        for i, dep in enumerate(template.names)
+    }
@@ -0,0 +1,357 @@
+import gc
+import mmap
+import struct
+from array import array
+from itertools import pairwise
+
+from .Expression import Expression
+from .formula import (
+    CellId,
+    CellRange,
+    Concat,
+    Divide,
+    Equal,
+    ErrorFormula,
+    GreaterThen,
+    If,
+    LessThen,
+    LiteralInt,
+    LiteralStr,
+    Max,
+    Min,
+    Minus,
+    Multiply,
+    Plus,
+    Power,
+    Sum,
+)
+from .range_values import RangeValues
+from .SpreadSheet import Spreadsheet
+from .template import FormulaTemplate
+
+# binary workbook: a header with the offset and length of every section, then the
+# sections, each one flat array. every string (names, formula texts, string values)
+# is stored once in the string table and referred to by index. formulas are kept as
+# their parsed templates, the graph, order and values as they were, so loading
+# neither parses nor rebuilds anything:
+#   strings_offsets, strings  utf-8 blob and the start of every string in it
+#   origins, template_starts, tokens  templates: origin (col, row), postfix ast tokens
+#   cells                     (name, expr, template or -1, offset col, offset row)
+#   deps_*, rev_deps_*        the dicts as keys, starts into a flat list, members
+#   order                     the topological order, first to last
+#   ranges, dirty             names
+#   value_*                   name, type tag and payload (ints/string indices, floats)
+
+MAGIC = b"SHEETWB\x00"
+VERSION = 1
+SECTIONS = (
+    ("strings_offsets", "q"),
+    ("strings", "B"),
+    ("origins", "i"),
+    ("template_starts", "q"),
+    ("tokens", "i"),
+    ("cells", "i"),
+    ("deps_keys", "i"),
+    ("deps_starts", "q"),
+    ("deps", "i"),
+    ("rev_deps_keys", "i"),
+    ("rev_deps_starts", "q"),
+    ("rev_deps", "i"),
+    ("order", "i"),
+    ("ranges", "i"),
+    ("dirty", "i"),
+    ("value_names", "i"),
+    ("value_tags", "B"),
+    ("value_ints", "q"),
+    ("value_floats", "d"),
+)
+_HEADER = struct.Struct(f"<8sII{2 * len(SECTIONS)}Q")
+
+# ast tokens, postfix: leaves carry one operand, list functions their argument count
+_INT, _BIG_INT, _STR, _CELL, _RANGE, _ERROR, _IF = range(7)
+_BINARY = (Power, Plus, Minus, Multiply, Divide, Equal, GreaterThen, LessThen)
+_LISTS = (Sum, Concat, Max, Min)
+_BINARY_TAGS = {kind: 7 + i for i, kind in enumerate(_BINARY)}
+_LIST_TAGS = {kind: 7 + len(_BINARY) + i for i, kind in enumerate(_LISTS)}
+
+# value tags, ranges are rebuilt from their members
+_V_INT, _V_FLOAT, _V_BOOL, _V_STR, _V_BIG_INT, _V_RANGE = range(6)
+_INT32 = 2**31
+_INT64 = 2**63
+
+
+def save(sheet: Spreadsheet, path) -> None:
+    strings = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    sections = {name: array(code) for name, code in SECTIONS}
+
+    templates = {}
+    cells = sections["cells"]
+    for name, expr in sheet.cells.items():
+        template = -1
+        if expr.template is not None:
+            template = templates.get(id(expr.template))
+            if template is None:
+                template = templates[id(expr.template)] = len(templates)
+                sections["origins"].extend(expr.template.origin)
+                sections["template_starts"].append(len(sections["tokens"]))
+                _encode(expr.template.tree, intern, sections["tokens"])
+        cells.extend((intern(name), intern(expr.expr), template, *expr.offset))
+    sections["template_starts"].append(len(sections["tokens"]))
+
+    for prefix, graph in (("deps", sheet.deps), ("rev_deps", sheet.rev_deps)):
+        keys = sections[f"{prefix}_keys"]
+        starts = sections[f"{prefix}_starts"]
+        members = sections[prefix]
+        for name, targets in graph.items():
+            keys.append(intern(name))
+            starts.append(len(members))
+            members.extend(map(intern, targets))
+        starts.append(len(members))
+
+    order = sorted(sheet.order.index, key=sheet.order.index.__getitem__)
+    sections["order"].extend(map(intern, order))
+    sections["ranges"].extend(map(intern, sheet.ranges.bounds))
+    sections["dirty"].extend(map(intern, sheet.dirty))
+
+    for name, value in sheet.values.items():
+        sections["value_names"].append(intern(name))
+        tags = sections["value_tags"]
+        kind = type(value)
+        if kind is int and -_INT64 <= value < _INT64:
+            tags.append(_V_INT)
+            sections["value_ints"].append(value)
+        elif kind is float:
+            tags.append(_V_FLOAT)
+            sections["value_floats"].append(value)
+        elif kind is bool:
+            tags.append(_V_BOOL)
+            sections["value_ints"].append(value)
+        elif kind is str:
+            tags.append(_V_STR)
+            sections["value_ints"].append(intern(value))
+        elif kind is int:
+            tags.append(_V_BIG_INT)
+            sections["value_ints"].append(intern(str(value)))
+        elif kind is RangeValues:
+            tags.append(_V_RANGE)
+        else:
+            raise ValueError(f"#ERROR Cannot save value of {name}: {value!r}")
+
+    blob = bytearray()
+    offsets = sections["strings_offsets"]
+    for text in strings:
+        offsets.append(len(blob))
+        blob += text.encode()
+    offsets.append(len(blob))
+    sections["strings"] = array("B", blob)
+
+    # sections start 8-aligned so every one can be cast straight from the map
+    position = _HEADER.size
+    layout = []
+    for name, _ in SECTIONS:
+        position += -position % 8
+        size = len(sections[name]) * sections[name].itemsize
+        layout.extend((position, size))
+        position += size
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(SECTIONS), *layout))
+        for name, _ in SECTIONS:
+            file.write(b"\x00" * (-file.tell() % 8))
+            sections[name].tofile(file)
+
+
+def load(path, **kwargs) -> Spreadsheet:
+    # kwargs go to Spreadsheet, e.g. columnar=True
+    with (
+        open(path, "rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        view = memoryview(mapped)
+        try:
+            sections = _read_sections(view)
+        finally:
+            view.release()
+
+    # every object built here stays alive, the collector's passes over the growing
+    # heap would only cost time (more than half of it, on big workbooks)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build(sections, kwargs)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _build(sections: dict, kwargs: dict) -> Spreadsheet:
+    blob = sections.pop("strings")
+    offsets = sections["strings_offsets"]
+    strings = [blob[start:end].decode() for start, end in pairwise(offsets)]
+
+    starts = sections["template_starts"]
+    origins = sections["origins"]
+    templates = [
+        FormulaTemplate(
+            _decode(sections["tokens"], starts[i], starts[i + 1], strings),
+            (origins[2 * i], origins[2 * i + 1]),
+        )
+        for i in range(len(starts) - 1)
+    ]
+
+    sheet = Spreadsheet(**kwargs)
+    cells = sections["cells"]
+    for i in range(0, len(cells), 5):
+        name, expr, template, dcol, drow = cells[i : i + 5]
+        shared = None if template < 0 else (templates[template], (dcol, drow))
+        sheet.cells[strings[name]] = Expression(strings[expr], strings[name], shared)
+
+    for prefix, graph in (("deps", sheet.deps), ("rev_deps", sheet.rev_deps)):
+        bounds = sections[f"{prefix}_starts"]
+        members = sections[prefix]
+        for i, key in enumerate(sections[f"{prefix}_keys"]):
+            graph[strings[key]] = {
+                strings[member] for member in members[bounds[i] : bounds[i + 1]]
+            }
+
+    for name in sections["ranges"]:
+        sheet.ranges.add(strings[name])
+    sheet.order.reset(map(strings.__getitem__, sections["order"]))
+    sheet.dirty = set(map(strings.__getitem__, sections["dirty"]))
+
+    ints = iter(sections["value_ints"])
+    floats = iter(sections["value_floats"])
+    ranges = []
+    values = {}
+    for name, tag in zip(sections["value_names"], sections["value_tags"]):
+        name = strings[name]
+        if tag == _V_INT:
+            values[name] = next(ints)
+        elif tag == _V_FLOAT:
+            values[name] = next(floats)
+        elif tag == _V_BOOL:
+            values[name] = bool(next(ints))
+        elif tag == _V_STR:
+            values[name] = strings[next(ints)]
+        elif tag == _V_BIG_INT:
+            values[name] = int(strings[next(ints)])
+        else:
+            ranges.append(name)
+    sheet.values.update(values)
+    for name in ranges:
+        members = sheet._range_members(name)
+        range_value = RangeValues(members, [values[cell] for cell in members])
+        sheet.values[name] = range_value
+        sheet.range_values[name] = range_value
+        sheet.range_changes[name] = set()
+    return sheet
+
+
+def _read_sections(view: memoryview) -> dict:
+    if len(view) < _HEADER.size:
+        raise ValueError("#ERROR Not a workbook file")
+    magic, version, count, *layout = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION or count != len(SECTIONS):
+        raise ValueError("#ERROR Not a workbook file")
+    sections = {}
+    for i, (name, code) in enumerate(SECTIONS):
+        offset, size = layout[2 * i], layout[2 * i + 1]
+        part = view[offset : offset + size]
+        if code == "B" and name == "strings":
+            sections[name] = bytes(part)
+        else:
+            with part.cast(code) as items:
+                sections[name] = items.tolist()
+        part.release()
+    return sections
+
+
+def _children(node) -> list:
+    kind = type(node)
+    if kind is Power:
+        return [node.base, node.power]
+    if kind in _BINARY_TAGS:
+        return [node.left, node.right]
+    if kind in _LIST_TAGS:
+        return node.formula_lst
+    if kind is If:
+        return [node.condition, node.then_expr, node.else_expr]
+    return []
+
+
+def _encode(tree, intern, tokens: array) -> None:
+    # postfix, iteratively so deep trees don't hit the recursion limit
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        children = _children(node)
+        if children and not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+        kind = type(node)
+        if kind is LiteralInt:
+            if -_INT32 <= node.value < _INT32:
+                tokens.extend((_INT, node.value))
+            else:
+                tokens.extend((_BIG_INT, intern(str(node.value))))
+        elif kind is LiteralStr:
+            tokens.extend((_STR, intern(node.value)))
+        elif kind is CellId:
+            tokens.extend((_CELL, intern(node.name)))
+        elif kind is CellRange:
+            tokens.extend((_RANGE, intern(node.name)))
+        elif kind is ErrorFormula:
+            tokens.extend((_ERROR, intern(node.message)))
+        elif kind is If:
+            tokens.append(_IF)
+        elif kind in _BINARY_TAGS:
+            tokens.append(_BINARY_TAGS[kind])
+        elif kind in _LIST_TAGS:
+            tokens.extend((_LIST_TAGS[kind], len(children)))
+        else:
+            raise ValueError(f"#ERROR Cannot save formula node {node!r}")
+
+
+def _decode(tokens: list, start: int, end: int, strings: list):
+    stack = []
+    i = start
+    while i < end:
+        tag = tokens[i]
+        if tag == _INT:
+            stack.append(LiteralInt(tokens[i + 1]))
+        elif tag == _BIG_INT:
+            stack.append(LiteralInt(int(strings[tokens[i + 1]])))
+        elif tag == _STR:
+            stack.append(LiteralStr(strings[tokens[i + 1]]))
+        elif tag == _CELL:
+            stack.append(CellId(strings[tokens[i + 1]]))
+        elif tag == _RANGE:
+            stack.append(CellRange(*strings[tokens[i + 1]].split(":")))
+        elif tag == _ERROR:
+            stack.append(ErrorFormula(strings[tokens[i + 1]]))
+        elif tag == _IF:
+            args = stack[-3:]
+            del stack[-3:]
+            stack.append(If(args))
+            i += 1
+            continue
+        elif tag < _IF + 1 + len(_BINARY):
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(_BINARY[tag - 7](left, right))
+            i += 1
+            continue
+        else:
+            count = tokens[i + 1]
+            args = stack[len(stack) - count :]
+            del stack[len(stack) - count :]
+            stack.append(_LISTS[tag - 7 - len(_BINARY)](args))
+        i += 2
+    return stack.pop()
@@ -0,0 +1,194 @@
+from bisect import bisect_right
+
+from rich.segment import Segment
+from textual.binding import Binding
+from textual.geometry import Region, Size, Spacing
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from sheet_engine.cell_ref import col_name, split_name
+
+COL_WIDTH = 10  # columns start this wide and only grow for longer values
+MAX_COL_WIDTH = 40
+
+
+# a grid over a Spreadsheet that keeps nothing per cell: only the lines on screen
+# are rendered, straight from the sheet's values, so a 1M x 1k sheet costs what
+# the viewport does. line 0 is the column header, the row numbers are fixed left
+class SheetGrid(ScrollView, can_focus=True):
+    DEFAULT_CSS = """
+        SheetGrid {
+            background: $surface;
+        }
+        SheetGrid > .sheet-grid--header {
+            text-style: bold;
+            background: $panel;
+        }
+        SheetGrid > .sheet-grid--cursor {
+            background: $accent;
+        }
+        """
+
+    COMPONENT_CLASSES = {"sheet-grid--header", "sheet-grid--cursor"}
+
+    BINDINGS = [
+        Binding("up", "move(0, -1)", show=False),
+        Binding("down", "move(0, 1)", show=False),
+        Binding("left", "move(-1, 0)", show=False),
+        Binding("right", "move(1, 0)", show=False),
+        Binding("pageup", "page(-1)", show=False),
+        Binding("pagedown", "page(1)", show=False),
+        Binding("enter", "select", show=False),
+    ]
+
+    class CellSelected(Message):
+        def __init__(self, name: str):
+            super().__init__()
+            self.name = name
+
+    cursor = reactive((0, 0), always_update=True)  # (col, row), 0-based
+
+    def __init__(self, sheet, rows: int, cols: int, **kwargs):
+        super().__init__(**kwargs)
+        self.sheet = sheet
+        self.row_count = rows
+        self.col_count = cols
+        self.widths = {}  # col -> width, only for columns grown past COL_WIDTH
+        self.label_width = len(str(rows)) + 2
+        self._update_offsets()
+
+    # geometry
+
+    def _update_offsets(self) -> None:
+        # x of every column's left edge after the labels, plus the total width
+        offsets = [0]
+        for col in range(self.col_count):
+            offsets.append(offsets[-1] + self.widths.get(col, COL_WIDTH))
+        self._offsets = offsets
+        self.virtual_size = Size(self.label_width + offsets[-1], self.row_count + 1)
+
+    def _col_at(self, x: int) -> int:
+        # the column under x, in data coordinates (0 = left edge of column A)
+        return min(bisect_right(self._offsets, x) - 1, self.col_count - 1)
+
+    def visible_range(self) -> tuple[range, range]:
+        # (cols, rows) on screen, 0-based
+        scroll_x, scroll_y = self.scroll_offset
+        width, height = self.scrollable_content_region.size
+        first_col = self._col_at(scroll_x)
+        last_col = self._col_at(scroll_x + max(width - self.label_width, 1) - 1)
+        last_row = min(scroll_y + height - 1, self.row_count)
+        return range(first_col, last_col + 1), range(scroll_y, last_row)
+
+    def visible_cells(self) -> set[str]:
+        cols, rows = self.visible_range()
+        names = [col_name(col) for col in cols]
+        return {f"{name}{row + 1}" for name in names for row in rows}
+
+    # painting
+
+    def repaint(self, names) -> None:
+        # one repaint for a batch of changed cells: each column that needs to grow
+        # is measured once, over the batch, then the screen is refreshed once
+        longest = {}
+        for name in names:
+            col, _ = split_name(name)
+            if col >= self.col_count:
+                continue
+            length = len(str(self.sheet.values.get(name, ""))) + 2
+            if length > longest.get(col, COL_WIDTH):
+                longest[col] = length
+        grown = False
+        for col, length in longest.items():
+            length = min(length, MAX_COL_WIDTH)
+            if length > self.widths.get(col, COL_WIDTH):
+                self.widths[col] = length
+                grown = True
+        if grown:
+            self._update_offsets()
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        rich_style = self.rich_style
+        header_style = self.get_component_rich_style("sheet-grid--header")
+        cols = range(self._col_at(scroll_x), self._col_at(scroll_x + width) + 1)
+        left = self._offsets[cols.start]
+
+        if y == 0:
+            label = Segment(" " * self.label_width, header_style)
+            texts = [
+                (col_name(col).center(self._width(col)), header_style) for col in cols
+            ]
+        else:
+            row = scroll_y + y - 1
+            if row >= self.row_count:
+                return Strip.blank(width, rich_style)
+            label = Segment(f" {row + 1}".ljust(self.label_width), header_style)
+            cursor_style = self.get_component_rich_style("sheet-grid--cursor")
+            cursor_col, cursor_row = self.cursor
+            texts = []
+            for col in cols:
+                text = self._cell_text(f"{col_name(col)}{row + 1}", self._width(col))
+                style = (
+                    cursor_style
+                    if (col, row) == (cursor_col, cursor_row)
+                    else rich_style
+                )
+                texts.append((text, style))
+
+        body = Strip([Segment(text, style) for text, style in texts])
+        start = scroll_x - left
+        body = body.crop(start, start + width - self.label_width)
+        return Strip.join([Strip([label]), body]).extend_cell_length(width, rich_style)
+
+    def _width(self, col: int) -> int:
+        return self.widths.get(col, COL_WIDTH)
+
+    def _cell_text(self, name: str, width: int) -> str:
+        value = self.sheet.values.get(name, "") if name in self.sheet.cells else ""
+        text = str(value)
+        if len(text) > width - 2:
+            text = text[: width - 3] + "…"
+        return f" {text}".ljust(width)
+
+    # cursor
+
+    def watch_cursor(self, cursor: tuple[int, int]) -> None:
+        col, row = cursor
+        region = Region(
+            self.label_width + self._offsets[col], row + 1, self._width(col), 1
+        )
+        # keep clear of the fixed header line and row labels
+        self.scroll_to_region(
+            region, spacing=Spacing(1, 0, 0, self.label_width), animate=False
+        )
+        self.refresh()
+
+    def action_move(self, dcol: int, drow: int) -> None:
+        col, row = self.cursor
+        col = max(0, min(col + dcol, self.col_count - 1))
+        row = max(0, min(row + drow, self.row_count - 1))
+        self.cursor = (col, row)
+
+    def action_page(self, direction: int) -> None:
+        self.action_move(
+            0, direction * max(self.scrollable_content_region.height - 2, 1)
+        )
+
+    def action_select(self) -> None:
+        col, row = self.cursor
+        self.post_message(self.CellSelected(f"{col_name(col)}{row + 1}"))
+
+    def on_click(self, event) -> None:
+        scroll_x, scroll_y = self.scroll_offset
+        if event.y < 1 or event.x < self.label_width:
+            return
+        row = scroll_y + event.y - 1
+        col = self._col_at(scroll_x + event.x - self.label_width)
+        if row < self.row_count:
+            self.cursor = (col, row)
+            self.action_select()
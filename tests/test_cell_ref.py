@@ -0,0 +1,34 @@
+from sheet_engine.cell_ref import (
+    cell_key,
+    cell_keys,
+    cell_name,
+    cell_names,
+    pack,
+    split_name,
+    unpack,
+)
+
+
+def test_cell_key_round_trip():
+    names = ["A1", "B3", "Z10", "AA1", "ZZ999", "XFD1048576"]
+    keys = cell_keys(names)
+    assert keys[1] == pack(1, 3)
+    assert unpack(keys[3]) == (26, 1)
+    assert cell_names(keys) == names
+    assert [split_name(name) for name in names] == [unpack(key) for key in keys]
+
+    # keys sort column by column, then by row
+    assert sorted(names, key=cell_key) == [
+        "A1",
+        "B3",
+        "Z10",
+        "AA1",
+        "ZZ999",
+        "XFD1048576",
+    ]
+    assert cell_name(pack(2, 7)) == "C7"
+
+
+def test_cell_key_rejects_other_names():
+    for name in ["total", "A1:B2", "a1", "A", "1", f"A{2**40}"]:
+        assert cell_key(name) is None
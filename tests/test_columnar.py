@@ -0,0 +1,51 @@
+from sheet_engine.SpreadSheet import Spreadsheet
+from sheet_engine.columnar import ColumnarValues
+
+
+def test_columnar_values_keep_types():
+    values = ColumnarValues()
+    samples = {
+        "A1": 3,
+        "A5": 2.5,
+        "B2": True,
+        "B3": False,
+        "C1": 2**60,
+        "C2": "text",
+        "C3": "#ERROR: Cell Z9 not found",
+        "A1:B2": [3, True],
+        "total": 7,
+    }
+    for name, value in samples.items():
+        values[name] = value
+    for name, value in samples.items():
+        assert values[name] == value
+        assert type(values[name]) is type(value)
+    assert len(values) == len(samples)
+    assert set(values) == set(samples)
+
+    values["A1"] = "now a string"
+    assert values["A1"] == "now a string"
+    values["C2"] = 4
+    assert values["C2"] == 4
+    del values["A5"]
+    assert "A5" not in values
+    assert values.pop("A7", None) is None
+    assert len(values) == len(samples) - 1
+
+
+def test_columnar_sheet_matches_dict_sheet():
+    sheets = [Spreadsheet(), Spreadsheet(columnar=True)]
+    for sheet in sheets:
+        for row in range(1, 21):
+            sheet.set_cell(f"A{row}", str(row))
+            sheet.set_cell(f"B{row}", f"=A{row}/4+Max(A{row}, 10)")
+        sheet.set_cell("C1", "=Sum(B1:B20)")
+        sheet.set_cell("C2", "=Concat(A1, 'x', C9)")
+        sheet.set_cell("C3", "=A1>A2")
+        sheet.set_cell("A3", "=Sum(A1, A2)")
+
+    names = [*sheets[0].cells, "C9"]
+    for name in names:
+        expected = sheets[0].get_cell_value(name)
+        assert sheets[1].get_cell_value(name) == expected
+        assert type(sheets[1].get_cell_value(name)) is type(expected)
@@ -0,0 +1,62 @@
+import io
+
+from sheet_engine import csv_io
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def test_csv_round_trip():
+    text = (
+        '1,2,=A1+B1\n=A3*10,,=Sum(A1:A3)\n5,x,"=Concat(B3,C1)"\n\n,"a,b",=Max(A1:A3)\n'
+    )
+    sheet = Spreadsheet()
+    # chunks of 2 rows, so A2 reads a cell of the next chunk
+    assert csv_io.import_csv(sheet, io.StringIO(text), chunk_rows=2) == 5
+    assert sheet.get_cell_value("A2") == 50
+    assert sheet.get_cell_value("C2") == 56
+
+    out = io.StringIO()
+    assert csv_io.export_csv(sheet, out) == 5
+    assert out.getvalue().splitlines() == [
+        "1,2,3",
+        "50,,56",
+        "5,x,x3",
+        "",
+        ',"a,b",50',
+    ]
+
+
+def test_import_rows_matches_set_cell():
+    def rows():
+        for row in range(1, 101):
+            yield [str(row), f"=B{row}*2", f"=C{row}+B{max(row - 1, 1)}"]
+
+    streamed = Spreadsheet()
+    assert csv_io.import_rows(streamed, rows(), chunk_rows=7, start="B1") == 100
+    single = Spreadsheet()
+    for row, fields in enumerate(rows(), 1):
+        for col, text in zip("BCD", fields):
+            single.set_cell(f"{col}{row}", text)
+
+    assert {n: e.expr for n, e in streamed.cells.items()} == {
+        n: e.expr for n, e in single.cells.items()
+    }
+    assert streamed.deps == single.deps
+    assert list(csv_io.export_rows(streamed, "B1")) == list(
+        csv_io.export_rows(single, "B1")
+    )
+    assert streamed.values == single.values
+    index = streamed.order.index
+    assert all(
+        index[dep] < index[name]
+        for name in streamed.cells
+        for dep in streamed.deps[name]
+    )
+
+
+def test_export_skips_named_cells():
+    sheet = Spreadsheet()
+    sheet.set_cell("A1", "2")
+    sheet.set_cell("B1", "=A1*3")
+    sheet.set_cell("total", "=B1+1")
+    assert sheet.get_cell_value("total") == 7
+    assert list(csv_io.export_rows(sheet)) == [[2, 6]]
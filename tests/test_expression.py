@@ -1,5 +1,8 @@
-import pytest  # noqa: F401
+import pytest
 from sheet_engine.SpreadSheet import Expression
+from sheet_engine.formula import ErrorFormula
+from sheet_engine.token import TokenType
+from sheet_engine.tokenizer import tokenize
 
 
 def test_basic_operators():
@@ -69,4 +72,75 @@ def test_equal_funcs():
     assert repr(expr.tree) == ("Equal(LiteralInt(10), LiteralInt(10))")
 
 
+def test_parse_grouping():
+    expr = Expression("=(A1>1)+2^3^2-8/4/2")
+    assert repr(expr.tree) == (
+        "Minus(Sum(GreaterThen(CellId(A1), LiteralInt(1)), "
+        "Power(Power(LiteralInt(2), LiteralInt(3)), LiteralInt(2))), "
+        "Divide(Divide(LiteralInt(8), LiteralInt(4)), LiteralInt(2)))"
+    )
+
+    # + chains and nested sums flatten into one Sum
+    expr = Expression("=(1+2)+Sum(3, 4)+A1")
+    assert repr(expr.tree) == (
+        "Sum(LiteralInt(1), LiteralInt(2), LiteralInt(3), LiteralInt(4), CellId(A1))"
+    )
+
+    # broken arguments become 0, broken formulas and calls too
+    assert repr(Expression("=Sum(,1)").tree) == "Sum(LiteralInt(0), LiteralInt(1))"
+    assert repr(Expression("=1+Sum(1").tree) == "Sum(LiteralInt(1), LiteralInt(0))"
+    assert repr(Expression("=1+2)").tree) == "LiteralInt(0)"
+    assert repr(Expression("=1 2").tree) == "LiteralInt(0)"
+
+
+def test_parse_deep_nesting():
+    depth = 200
+    expr = Expression("=" + "If(A1, Sum(1, " * depth + "2" + "), 0)" * depth)
+    assert expr.get_dependencies() == {"A1"}
+    assert expr.evaluate({"A1": 1}) == depth + 2
+
+
+def test_compiled_matches_interpreter():
+    values = {"A1": 3, "B1": 4.5, "C1": "x", "D1": 0}
+    formulas = [
+        "=A1+B1*2-7/A1",
+        "=(A1+2)^2+A1^B1",
+        "=Sum(A1, B1, 5, Max(A1, 9), Min(B1, 1))",
+        "=Concat(C1, A1, 'y', B1)",
+        "=If(A1>B1, C1, If(D1=0, 'zero', 'other'))",
+        "=A1<B1",
+        "=10=10",
+    ]
+    for formula in formulas:
+        expr = Expression(formula)
+        assert not isinstance(expr.tree, ErrorFormula)
+        assert expr.evaluate(values, compiled=True) == expr.evaluate(values)
+
+
+def test_tokenize():
+    tokens = tokenize("=Max(A1:B2, 10)+Concat('a b', C3)^2"[1:])
+    assert [(token.type, token.value) for token in tokens] == [
+        (TokenType.FUNC, "Max"),
+        (TokenType.PAREN_OPEN, "("),
+        (TokenType.RANGE, "A1:B2"),
+        (TokenType.COMMA, ","),
+        (TokenType.INT, "10"),
+        (TokenType.PAREN_CLOSE, ")"),
+        (TokenType.OP, "+"),
+        (TokenType.FUNC, "Concat"),
+        (TokenType.PAREN_OPEN, "("),
+        (TokenType.STR, "a b"),
+        (TokenType.COMMA, ","),
+        (TokenType.CELL, "C3"),
+        (TokenType.PAREN_CLOSE, ")"),
+        (TokenType.OP, "^"),
+        (TokenType.INT, "2"),
+    ]
+
+    with pytest.raises(ValueError):
+        tokenize("A1 + 'open")
+    with pytest.raises(ValueError):
+        tokenize("A1 # 2")
+
+
 # python -m pytest tests/test_expression.py
@@ -0,0 +1,70 @@
+import pytest
+from sheet_engine.Expression import Expression
+from sheet_engine.formula import ErrorFormula
+from sheet_engine.optimizer import simplify
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def simplified(formula: str) -> str:
+    return repr(simplify(Expression(formula).tree))
+
+
+def test_simplify():
+    assert simplified("=(3*3)+A1+A1+B1") == (
+        "Sum(LiteralInt(9), Multiply(LiteralInt(2), CellId(A1)), CellId(B1))"
+    )
+    assert simplified("=A1+2+B1+3") == "Sum(LiteralInt(5), CellId(A1), CellId(B1))"
+    assert simplified("=A1+0") == "Sum(CellId(A1))"
+    assert simplified("=2^3*(4-1)") == "LiteralInt(24)"
+    assert simplified("=Concat('a', 1, Max(2, 3))") == "LiteralStr(a13)"
+    assert simplified("=If(1>2, A1, B1*(2+2))") == (
+        "Multiply(CellId(B1), LiteralInt(4))"
+    )
+    assert (
+        simplified("=If(A1, 1+1, 3)") == "If(CellId(A1), LiteralInt(2), LiteralInt(3))"
+    )
+    # left for evaluation: errors, floats and bools
+    assert simplified("=1/0+A1") == (
+        "Sum(Divide(LiteralInt(1), LiteralInt(0)), CellId(A1))"
+    )
+    assert simplified("=7/2") == "Divide(LiteralInt(7), LiteralInt(2))"
+    assert simplified("=2^100000") == "Power(LiteralInt(2), LiteralInt(100000))"
+    # the parsed tree is shared and stays as written
+    expr = Expression("=(3*3)+A1")
+    simplify(expr.tree)
+    assert repr(expr.tree) == (
+        "Sum(Multiply(LiteralInt(3), LiteralInt(3)), CellId(A1))"
+    )
+
+
+def test_simplified_matches_interpreter():
+    values = {"A1": 3, "B1": 4.5, "C1": "x", "D1": 0, "E1": True}
+    formulas = [
+        "=A1+A1+2*3-7/A1",
+        "=(A1+2)^2+A1^B1+(1+1)^2",
+        "=Sum(A1, B1, 5, Max(A1, 9), Min(B1, 1), 3, A1)",
+        "=Concat(C1, A1, 'y', 1+2, B1)",
+        "=If(A1>B1, C1, If(1=1, 'one', 'other'))",
+        "=If(0, C1, E1+E1+1)",
+        "=D1+(10-2*5)",
+    ]
+    for formula in formulas:
+        expr = Expression(formula)
+        assert not isinstance(expr.tree, ErrorFormula)
+        assert expr.evaluate(values, simplified=True) == expr.evaluate(values)
+        assert expr.evaluate(values, True, True) == expr.evaluate(values)
+
+    # a string in a Sum still fails, even when it is a repeated cell
+    for formula in ["=C1+C1", "=C1+1+2"]:
+        with pytest.raises(TypeError):
+            Expression(formula).evaluate(values, simplified=True)
+
+
+def test_sheet_simplify_formulas():
+    cells = {"A1": "2", "B1": "=A1+A1+(2*5)", "C1": "=If(1<2, B1, A1)*A1+3"}
+    sheet = Spreadsheet(simplify_formulas=True)
+    plain = Spreadsheet()
+    for target in (sheet, plain):
+        target.set_cells(cells)
+        target.set_cell("A1", "5")
+    assert sheet.get_cell_value("C1") == plain.get_cell_value("C1") == 103
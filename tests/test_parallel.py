@@ -0,0 +1,29 @@
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def wide_sheet(**kwargs) -> Spreadsheet:
+    sheet = Spreadsheet(**kwargs)
+    cells = {"A1": "3", "A2": "=A1*2"}
+    for row in range(1, 401):
+        cells[f"B{row}"] = f"=A1*{row}+A2/4"
+        cells[f"C{row}"] = f"=B{row}^2-Max(B{row}, 50)"
+        cells[f"D{row}"] = f"=Concat(C{row}, '-', E{row})"
+    cells["F1"] = "=Sum(C1:C400)"
+    cells["F2"] = "=F1/B7"
+    sheet.set_cells(cells)
+    return sheet
+
+
+def test_parallel_matches_serial():
+    serial = wide_sheet()
+    parallel = wide_sheet(workers=2)
+    try:
+        for sheet in (serial, parallel):
+            sheet.recalculate()
+            sheet.set_cell("A1", "5")
+        assert parallel.recalculate() == serial.recalculate()
+        assert parallel.values == serial.values
+        assert parallel.evaluation_count == serial.evaluation_count
+        assert parallel.dirty == set()
+    finally:
+        parallel.close()
@@ -0,0 +1,55 @@
+from sheet_engine.scheduler import RecalcScheduler
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def fan_out_sheet() -> Spreadsheet:
+    # B1..B300 and a chain down column C all read A1, C300 sums column B
+    sheet = Spreadsheet()
+    cells = {"A1": "2", "C1": "=A1+1"}
+    for row in range(1, 301):
+        cells[f"B{row}"] = f"=A1*{row}"
+    for row in range(2, 300):
+        cells[f"C{row}"] = f"=C{row - 1}+B{row}"
+    cells["C300"] = "=Sum(B1:B300)+C299"
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+def test_scheduler_computes_visible_cells_first():
+    sheet = fan_out_sheet()
+    scheduler = RecalcScheduler(sheet)
+    sheet.set_cell("A1", "3")
+    scheduler.set_visible(["B7", "D1"])
+
+    assert scheduler.step(budget=2) == ["A1", "B7"]
+    assert sheet.values["B7"] == 21
+    assert "B8" not in sheet.values
+    assert not scheduler.done
+
+    count = 0
+    while not scheduler.done:
+        assert len(scheduler.step(budget=50)) <= 50
+        count += 1
+    assert count > 5
+
+    expected = fan_out_sheet()
+    expected.set_cell("A1", "3")
+    expected.recalculate()
+    assert sheet.values == expected.values
+    assert sheet.dirty == set()
+
+
+def test_scheduler_after_more_edits():
+    sheet = fan_out_sheet()
+    scheduler = RecalcScheduler(sheet)
+    sheet.set_cell("A1", "3")
+    scheduler.set_visible(["C300"])
+    scheduler.step(budget=100)
+    # an edit mid-way, the plan is made again
+    sheet.set_cell("B5", "=A1-100")
+    scheduler.reset()
+    while not scheduler.done:
+        scheduler.step()
+    assert sheet.values["C300"] == sheet.values["C299"] + 3 * 45150 - 15 - 97
+    assert sheet.dirty == set()
@@ -0,0 +1,166 @@
+import random
+
+import pytest
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def check_order(sheet: Spreadsheet) -> None:
+    index = sheet.order.index
+    for name, deps in sheet.deps.items():
+        for dep in deps:
+            assert index[dep] < index[name]
+    for range_name in sheet.ranges.bounds:
+        for member in sheet._range_members(range_name, sheet.deps):
+            assert index[member] < index[range_name]
+
+
+def random_cells(count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    cells = {}
+    for row in range(1, count + 1):
+        if row < 5 or rng.random() < 0.3:
+            cells[f"A{row}"] = str(rng.randint(0, 9))
+        else:
+            a, b = rng.randint(1, row - 1), rng.randint(1, row - 1)
+            cells[f"A{row}"] = rng.choice(
+                [f"=A{a}+A{b}", f"=Max(A{a}, 3)*2", f"=Sum(A1:A{a})-A{b}"]
+            )
+    names = list(cells)
+    rng.shuffle(names)
+    return {name: cells[name] for name in names}
+
+
+def test_set_cells_matches_set_cell():
+    cells = random_cells(300, 1)
+    bulk = Spreadsheet()
+    bulk.set_cells(cells)
+    single = Spreadsheet()
+    for name, expr in cells.items():
+        single.set_cell(name, expr)
+
+    check_order(bulk)
+    assert bulk.deps == single.deps
+    for name in cells:
+        assert bulk.get_cell_value(name) == single.get_cell_value(name)
+
+    # a small batch into a big sheet keeps the order incrementally
+    edits = {"A2": "=A3+1", "A301": "=A2*2", "A3": "7"}
+    bulk.set_cells(edits)
+    for name, expr in edits.items():
+        single.set_cell(name, expr)
+    check_order(bulk)
+    for name in single.cells:
+        assert bulk.get_cell_value(name) == single.get_cell_value(name)
+
+
+def test_set_cells_new_cell_in_range_reads_unseen_cell():
+    sheet = Spreadsheet()
+    sheet.set_cells({"A2": "2", "B1": "3", "B2": "4", "B3": "5"})
+    sheet.set_cells({"C4": "=Sum(A1:A2)", "C5": "=C4"})
+    assert sheet.get_cell_value("C5") == 2
+    # A1 is new, inside the range, and reads a cell the order hasn't seen
+    sheet.set_cells({"A1": "=D4"})
+    check_order(sheet)
+    sheet.set_cell("D4", "10")
+    assert sheet.get_cell_value("C5") == 12
+
+    # chunks of forward references under a range, as a csv import sends them
+    sheet = Spreadsheet()
+    sheet.set_cells({"A1": "=Sum(A2:A30)"})
+    for start in range(2, 31, 5):
+        rows = range(start, min(start + 5, 31))
+        sheet.set_cells({f"A{row}": f"=C{row}" for row in rows})
+        sheet.set_cells({f"C{row}": "1" for row in rows})
+        check_order(sheet)
+    assert sheet.get_cell_value("A1") == 29
+
+
+def test_set_cells_cycles():
+    sheet = Spreadsheet()
+    sheet.set_cells({"A1": "1", "B1": "=C1+A1", "C1": "=B1", "D1": "=D1", "E1": "=B1"})
+    error = "#ERROR Circular dependency detected"
+    assert sheet.get_cell_value("B1") == error
+    assert sheet.get_cell_value("C1") == error
+    assert sheet.get_cell_value("D1") == error
+    assert sheet.get_cell_value("E1") == error
+    check_order(sheet)
+
+    # only the edited cells on a new cycle are errors, through ranges too
+    sheet.set_cells({"F1": "=Sum(A1:A3)", "G1": "=F1"})
+    sheet.set_cells({"A2": "=G1", "H1": "=A1+1"})
+    assert sheet.get_cell_value("A2") == error
+    assert sheet.get_cell_expr("G1").expr == "=F1"
+    assert sheet.get_cell_value("H1") == 2
+    sheet.set_cell("A3", "=Sum(A1:A5)")
+    assert sheet.get_cell_value("A3") == error
+    check_order(sheet)
+
+    sheet.set_cells({"A2": "5", "A3": "0"})
+    assert sheet.get_cell_value("F1") == 6
+    assert sheet.get_cell_value("G1") == 6
+
+
+def test_batch_applies_on_exit():
+    sheet = Spreadsheet()
+    sheet.set_cells({"A1": "1", "A2": "2", "B1": "=Sum(A1:A3)"})
+    assert sheet.get_cell_value("B1") == 3
+
+    with sheet.batch():
+        sheet.set_cell("A1", "10")
+        sheet.set_cell("A3", "=A1*2")
+        with sheet.batch():
+            sheet.set_cells({"A2": "20"})
+        # nothing applied before the outer block ends
+        assert sheet.get_cell_value("B1") == 3
+    assert sheet.dirty == set()
+    assert sheet.get_cell_value("B1") == 50
+
+    # an exception drops the buffered edits
+    try:
+        with sheet.batch():
+            sheet.set_cell("A1", "0")
+            raise KeyError("stop")
+    except KeyError:
+        pass
+    assert sheet.get_cell_value("A1") == 10
+
+
+def test_batch_keeps_edits_whose_formulas_fail():
+    sheet = Spreadsheet()
+    sheet.set_cells({"A1": "1", "B1": "=A1*2"})
+    # Z9 is empty, =Z9+1 raises when computed, but the batch itself went through
+    with sheet.batch():
+        sheet.set_cells({"A1": "5", "C1": "=Z9+1", "D1": "=C1*2", "E1": "=A1+1"})
+    assert sheet.get_cell_value("B1") == 10
+    assert sheet.get_cell_value("E1") == 6
+    assert sheet.dirty == {"C1", "D1"}
+
+    # recalculate computes what it can, keeps the failing cells dirty and raises
+    sheet.set_cell("A1", "7")
+    with pytest.raises(TypeError):
+        sheet.recalculate()
+    assert sheet.values["B1"] == 14
+    assert sheet.dirty == {"C1", "D1"}
+    sheet.set_cell("Z9", "1")
+    assert sheet.recalculate() == ["Z9", "C1", "D1"]
+    assert sheet.get_cell_value("D1") == 4
+
+
+def test_batch_rolls_back_cycles():
+    sheet = Spreadsheet()
+    sheet.set_cells({"A1": "1", "A2": "=A1+1", "B1": "=Sum(A1:A5)"})
+    assert sheet.get_cell_value("B1") == 3
+
+    with pytest.raises(ValueError), sheet.batch():
+        sheet.set_cell("A1", "5")
+        sheet.set_cell("A4", "7")
+        sheet.set_cell("C1", "=A2")
+        sheet.set_cell("A3", "=B1")
+
+    assert set(sheet.cells) == {"A1", "A2", "B1"}
+    assert sheet.get_cell_expr("A1").expr == "1"
+    assert sheet.get_cell_value("B1") == 3
+    check_order(sheet)
+
+    sheet.set_cell("A4", "7")
+    assert sheet.get_cell_value("B1") == 10
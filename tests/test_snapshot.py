@@ -0,0 +1,90 @@
+import random
+
+import pytest
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def build(cells: dict) -> Spreadsheet:
+    sheet = Spreadsheet()
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    return sheet
+
+
+def base_cells(rows: int) -> dict:
+    cells = {}
+    for row in range(1, rows + 1):
+        cells[f"A{row}"] = str(row)
+        cells[f"B{row}"] = f"=A{row}*2+B{row - 1}" if row > 1 else "=A1"
+        cells[f"C{row}"] = f"=Sum(A1:A{row})-B{row}"
+    cells["D1"] = f"=Max(C1:C{rows})"
+    return cells
+
+
+def test_restore_undoes_edits_without_recomputing():
+    cells = base_cells(30)
+    expected = build(cells)
+    sheet = build(cells)
+    rng = random.Random(7)
+    for _ in range(20):
+        snapshot = sheet.snapshot()
+        edits = {}
+        for _ in range(rng.randint(1, 4)):
+            row = rng.randint(2, 35)  # rows past 30 are new cells
+            edits[f"A{row}"] = rng.choice([str(rng.randint(0, 9)), f"=A{row - 1}+1"])
+        sheet.set_cells(edits)
+        sheet.get_cell_value("D1")
+        count = sheet.evaluation_count
+        sheet.restore(snapshot)
+        assert sheet.evaluation_count == count
+
+        assert {n: e.expr for n, e in sheet.cells.items()} == {
+            n: e.expr for n, e in expected.cells.items()
+        }
+        assert sheet.deps == expected.deps
+        assert {n: d for n, d in sheet.rev_deps.items() if d} == {
+            n: d for n, d in expected.rev_deps.items() if d
+        }
+        assert sheet.values == expected.values
+        assert not sheet.dirty
+        assert sheet.recalculate() == []
+        # invalidation still reaches everything downstream after a restore
+        sheet.set_cell("A3", "100")
+        expected.set_cell("A3", "100")
+        assert sheet.get_cell_value("D1") == expected.get_cell_value("D1")
+        sheet.set_cell("A3", "3")
+        expected.set_cell("A3", "3")
+        sheet.recalculate()
+        expected.recalculate()
+
+
+def test_evaluate_scenarios():
+    sheet = build(base_cells(10))
+    before = dict(sheet.values)
+    results = sheet.evaluate_scenarios(
+        [{"A1": "5"}, {"A10": "0", "E1": "=D1+1"}, {}], ["B10", "D1"]
+    )
+    for edits, result in zip([{"A1": "5"}, {"A10": "0", "E1": "=D1+1"}, {}], results):
+        single = build({**base_cells(10), **edits})
+        assert result == {
+            "B10": single.get_cell_value("B10"),
+            "D1": single.get_cell_value("D1"),
+        }
+    assert sheet.values == before
+    assert "E1" not in sheet.cells
+
+    snapshot = sheet.snapshot()
+    with pytest.raises(ValueError):
+        sheet.snapshot()
+    sheet.restore(snapshot)
+    with pytest.raises(ValueError):
+        sheet.restore(snapshot)
+
+
+def test_restore_caches_range_a_scenario_stopped_reading():
+    sheet = build({"A1": "1", "C1": "=Sum(A1:A2)"})
+    assert sheet.get_cell_value("C1") == 1
+    assert sheet.evaluate_scenarios([{"C1": "5"}], ["C1"]) == [{"C1": 5}]
+    assert sheet.get_cell_value("C1") == 1
+    sheet.set_cell("A1", "10")
+    assert sheet.get_cell_value("C1") == 10
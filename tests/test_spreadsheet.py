@@ -260,4 +260,118 @@ def test_if_formula():
     assert sheet.get_cell_value("A1") == "False"
 
 
+def test_long_dependency_chain():
+    sheet = Spreadsheet()
+    length = 5000
+    for row in range(length, 1, -1):
+        sheet.set_cell(f"A{row}", f"=A{row - 1}+1")
+    sheet.set_cell("A1", "1")
+
+    assert sheet.get_cell_value(f"A{length}") == length
+    assert sheet.evaluation_count == length
+
+    sheet.set_cell("A1", "10")
+    sheet.evaluation_count = 0
+    assert sheet.get_cell_value(f"A{length}") == length + 9
+    assert sheet.evaluation_count == length
+
+
+def test_recalculate_layered_diamonds():
+    sheet = Spreadsheet()
+    layers = 20
+    sheet.set_cell("A1", "1")
+    sheet.set_cell("B1", "1")
+    for row in range(2, layers + 1):
+        sheet.set_cell(f"A{row}", f"=A{row - 1}+B{row - 1}")
+        sheet.set_cell(f"B{row}", f"=A{row - 1}+B{row - 1}")
+    sheet.recalculate()
+    assert sheet.get_cell_value(f"A{layers}") == 2 ** (layers - 1)
+
+    # each of the 2^19 paths from A1 must not cost a visit
+    sheet.invalidation_count = 0
+    sheet.evaluation_count = 0
+    sheet.set_cell("A1", "3")
+    assert sheet.invalidation_count == 2 * layers - 1
+
+    order = sheet.recalculate()
+    assert len(order) == 2 * layers - 1
+    assert order[0] == "A1"
+    assert sheet.evaluation_count == 2 * layers - 1
+    assert sheet.get_cell_value(f"B{layers}") == 2 ** (layers - 1) * 2
+    assert sheet.recalculate() == []
+
+    # reading a value also takes it off the dirty set
+    sheet.set_cell("A1", "4")
+    sheet.get_cell_value(f"A{layers}")
+    assert sheet.dirty == {f"B{layers}"}
+
+
+def test_set_cell_parses_once(monkeypatch):
+    from sheet_engine import Expression as expression_module
+    from sheet_engine.parse_cache import ParseCache
+
+    cache = ParseCache()
+    monkeypatch.setattr(expression_module, "parse_cache", cache)
+
+    sheet = Spreadsheet()
+    sheet.set_cell("A1", "2")
+    sheet.set_cell("B1", "=A1*3")
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert sheet.get_cell_value("B1") == 6
+
+
+def test_parse_cache_shares_trees(monkeypatch):
+    from sheet_engine import Expression as expression_module
+    from sheet_engine.parse_cache import ParseCache
+
+    cache = ParseCache()
+    monkeypatch.setattr(expression_module, "parse_cache", cache)
+
+    sheet = Spreadsheet()
+    sheet.set_cell("A1", "4")
+    for row in range(1, 4):
+        sheet.set_cell(f"B{row}", "=A1*2")
+    assert sheet.cells["B1"].tree is sheet.cells["B3"].tree
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert sheet.get_cell_value("B2") == 8
+
+    cache = ParseCache(maxsize=2)
+    cache.parse("A1+1")
+    cache.parse("A1+2")
+    cache.parse("A1+1")
+    cache.parse("A1*2")  # evicts A1+2, the least recently used
+    assert len(cache) == 2
+    cache.parse("A1+2")
+    assert (cache.hits, cache.misses) == (1, 4)
+
+    cache.resize(1)
+    assert len(cache) == 1
+
+
+def test_fill_down_shares_template():
+    sheet = Spreadsheet()
+    for row in range(1, 101):
+        sheet.set_cell(f"A{row}", str(row))
+        sheet.set_cell(f"B{row}", "7")
+        sheet.set_cell(f"C{row}", f"=A{row}*B{row}+If(A{row}>50, 1, 0)")
+
+    first = sheet.cells["C1"]
+    last = sheet.cells["C100"]
+    assert first.template is last.template
+    assert last.offset == (0, 99)
+    assert sheet.deps["C100"] == {"A100", "B100"}
+    assert sheet.get_cell_value("C40") == 280
+    assert sheet.get_cell_value("C100") == 701
+
+    sheet.set_cell("B100", "1")
+    assert sheet.get_cell_value("C100") == 101
+    assert sheet.get_cell_value("C99") == 694
+
+
+def test_formula_in_non_a1_cell():
+    sheet = Spreadsheet()
+    sheet.set_cell("total", "=1+2")
+    assert sheet.get_cell_value("total") == 3
+
+
 # python3 -m pytest tests/test_spreadsheet.py
@@ -0,0 +1,61 @@
+import random
+
+import pytest  # noqa: F401
+from sheet_engine.SpreadSheet import Spreadsheet
+
+CIRCULAR = "#ERROR Circular dependency detected"
+
+
+def reaches(deps, start, goal):
+    stack = [start]
+    seen = set()
+    while stack:
+        current = stack.pop()
+        if current == goal:
+            return True
+        if current not in seen:
+            seen.add(current)
+            stack.extend(deps.get(current, ()))
+    return False
+
+
+def test_cycle_after_reorder():
+    sheet = Spreadsheet()
+    sheet.set_cell("A1", "=B1")
+    sheet.set_cell("B1", "=C1")
+    sheet.set_cell("C1", "=D1")
+    sheet.set_cell("D1", "1")
+    assert sheet.get_cell_value("A1") == 1
+
+    sheet.set_cell("D1", "=A1")
+    assert sheet.get_cell_value("D1") == CIRCULAR
+
+    sheet.set_cell("D1", "=E1+1")
+    sheet.set_cell("E1", "5")
+    assert sheet.get_cell_value("A1") == 6
+
+
+def test_random_edits_match_full_search():
+    rng = random.Random(7)
+    names = [f"{col}{row}" for col in "ABCD" for row in range(1, 6)]
+    sheet = Spreadsheet()
+    deps = {}
+
+    for _ in range(2000):
+        name = rng.choice(names)
+        refs = rng.sample(names, rng.randint(0, 3))
+        expr = "=" + "+".join(refs) if refs else str(rng.randint(0, 9))
+        expected_cycle = any(reaches(deps, ref, name) for ref in refs)
+
+        sheet.set_cell(name, expr)
+        is_error = sheet.get_cell_expr(name).expr == CIRCULAR
+        assert is_error == expected_cycle
+        deps[name] = set() if expected_cycle else set(refs)
+
+        # the maintained order must respect every edge
+        for cell, cell_deps in sheet.deps.items():
+            for dep in cell_deps:
+                assert sheet.order.index[dep] < sheet.order.index[cell]
+
+
+# python -m pytest tests/test_topo_order.py
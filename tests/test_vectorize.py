@@ -0,0 +1,53 @@
+import pytest
+
+from sheet_engine.SpreadSheet import Spreadsheet
+
+pytest.importorskip("numpy")
+
+
+FORMULAS = [
+    "=A{n}*B{n}+1",
+    "=A{n}/B{n}-A{n}^2",
+    "=If(A{n}>B{n}, A{n}, 0-A{n})",
+    "=Max(A{n}, C{n})+Min(A{n}, 7)",
+    "=Sum(A{n}, C{n}, D{n})*(A{n}=3)",
+    "=C{n}/(A{n}-9)",
+    "=Concat(A{n}, '-', C{n})",
+    "=A{n}^30*A{n}^30",
+    "=If(A{n}>4, A{n}/2, A{n})*3",
+]
+
+
+def block_sheet(**kwargs) -> Spreadsheet:
+    sheet = Spreadsheet(**kwargs)
+    cells = {}
+    for n in range(1, 201):
+        cells[f"A{n}"] = str(n % 9)
+        cells[f"B{n}"] = f"=A{n}/4+{n}"
+        for i, formula in enumerate(FORMULAS):
+            cells[f"{'CDEFGHIJK'[i]}{n}"] = formula.format(n=n)
+    sheet.set_cells(cells)
+    return sheet
+
+
+def test_vectorize_matches_scalar():
+    scalar = block_sheet()
+    vectorized = block_sheet(vectorize=True)
+    for sheet in (scalar, vectorized):
+        sheet.recalculate()
+        sheet.set_cells({"A1": "6", "A7": "11", "A8": "=0-40"})
+    assert vectorized.recalculate() == scalar.recalculate()
+    assert vectorized.values == scalar.values
+    for name, value in scalar.values.items():
+        assert type(vectorized.values[name]) is type(value)
+    assert vectorized.evaluation_count == scalar.evaluation_count
+    assert vectorized.dirty == set()
+
+
+def test_vectorize_falls_back_to_cells():
+    # a zero divisor is left to the scalar pass, which raises like it always did
+    sheet = block_sheet(vectorize=True)
+    sheet.recalculate()
+    sheet.set_cell("A3", "9")
+    with pytest.raises(ZeroDivisionError):
+        sheet.recalculate()
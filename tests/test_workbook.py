@@ -0,0 +1,72 @@
+import pytest
+
+from sheet_engine import workbook
+from sheet_engine.SpreadSheet import Spreadsheet
+
+
+def sample_sheet() -> Spreadsheet:
+    sheet = Spreadsheet()
+    cells = {
+        "A1": "7",
+        "A2": "=A1/2",
+        "A3": "=A1^40",
+        "A4": "hello",
+        "A5": "=A1>3",
+        "A6": "=Concat(A4, ' ', A1, \"!\")",
+        "B1": "=If(A5, Sum(A1:A3, 4), 0-Max(A1, A2))",
+        "B2": "=Min(A1:A2)*(2+A1)-A1",
+        "B3": "=Sum(A1, ",
+        "B4": "=B5",
+    }
+    for row in range(1, 51):
+        cells[f"C{row}"] = f"=D{row}*2"
+        cells[f"D{row}"] = str(row)
+    sheet.set_cells(cells)
+    sheet.recalculate()
+    sheet.set_cell("B5", "=B4")  # circular, rejected
+    sheet.set_cell("D3", "30")  # left dirty
+    return sheet
+
+
+def test_workbook_round_trip(tmp_path):
+    sheet = sample_sheet()
+    path = tmp_path / "book.sheet"
+    workbook.save(sheet, path)
+    loaded = workbook.load(path)
+
+    assert {n: e.expr for n, e in loaded.cells.items()} == {
+        n: e.expr for n, e in sheet.cells.items()
+    }
+    assert {n: repr(e.tree) for n, e in loaded.cells.items()} == {
+        n: repr(e.tree) for n, e in sheet.cells.items()
+    }
+    assert loaded.deps == sheet.deps
+    assert loaded.rev_deps == sheet.rev_deps
+    assert loaded.ranges.bounds == sheet.ranges.bounds
+    assert loaded.dirty == sheet.dirty
+    assert loaded.values == sheet.values
+    assert type(loaded.values["A5"]) is bool
+    order = loaded.order.index
+    for name, deps in loaded.deps.items():
+        assert all(order[dep] < order[name] for dep in deps)
+
+    # cells sharing a template still share it
+    assert loaded.cells["C7"].template is loaded.cells["C40"].template
+
+    for book in (sheet, loaded):
+        book.set_cell("A1", "9")
+        book.recalculate()
+    assert loaded.values == sheet.values
+
+
+def test_workbook_columnar_and_bad_file(tmp_path):
+    sheet = sample_sheet()
+    path = tmp_path / "book.sheet"
+    workbook.save(sheet, path)
+    loaded = workbook.load(path, columnar=True)
+    assert dict(loaded.values) == dict(sheet.values)
+
+    bad = tmp_path / "bad.sheet"
+    bad.write_bytes(b"not a workbook" * 20)
+    with pytest.raises(ValueError):
+        workbook.load(bad)